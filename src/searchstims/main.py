@@ -109,6 +109,11 @@ def main():
                               '$ searchstims ./basic_config.ini\n'
                               'For an example config.ini file, see: '
                               'https://github.com/NickleDave/searchstims'))
+    parser.add_argument('--num-workers',
+                        type=int,
+                        default=1,
+                        help=('number of processes to use when making stimuli. '
+                              'Default is 1, i.e. stimuli are made one after another in a single process.'))
     args = parser.parse_args()
     config_file = args.configfile
     if not os.path.isfile(config_file):
@@ -120,7 +125,8 @@ def main():
          csv_filename=config.general.csv_filename,
          num_target_present=config.general.num_target_present,
          num_target_absent=config.general.num_target_absent,
-         set_sizes=config.general.set_sizes)
+         set_sizes=config.general.set_sizes,
+         num_workers=args.num_workers)
 
 
 if __name__ == '__main__':
@@ -1,17 +1,151 @@
-from itertools import combinations, product
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
 import json
 from math import ceil
+import multiprocessing
 from pathlib import Path
 import random
+from typing import NamedTuple
 
 import numpy as np
 import pygame
+from scipy.special import comb
 
 from .stim_makers import AbstractStimMaker
 from .utils import make_csv
 from .voc import Writer
 
 
+def _binomial_table(n, k):
+    """helper function that computes table of binomial coefficients,
+    where ``table[c][i]`` is the number of combinations of c elements taken i at a time,
+    for 0 <= c <= n and 0 <= i <= k. Values are Python ints, so they do not overflow.
+    """
+    table = [[0] * (k + 1) for _ in range(n + 1)]
+    for c in range(n + 1):
+        table[c][0] = 1
+        for i in range(1, min(c, k) + 1):
+            table[c][i] = table[c - 1][i - 1] + table[c - 1][i]
+    return table
+
+
+def _unrank_combination(rank, n, k, binomials):
+    """helper function that finds the combination of k elements from range(n)
+    with a given rank in the combinatorial number system,
+    i.e. the unique c_1 < c_2 < ... < c_k such that
+    rank = C(c_1, 1) + C(c_2, 2) + ... + C(c_k, k).
+
+    Parameters
+    ----------
+    rank : int
+        in the range [0, C(n, k)).
+    n : int
+        number of elements to choose from.
+    k : int
+        number of elements in combination.
+    binomials : list
+        table of binomial coefficients returned by ``_binomial_table(n, k)``
+
+    Returns
+    -------
+    combination : tuple
+        of k ints, in increasing order (the same as tuples returned by itertools.combinations)
+    """
+    combination = []
+    c = n
+    for i in range(k, 0, -1):
+        # find largest c such that C(c, i) <= rank; it is always less than the c found for i + 1
+        c -= 1
+        while binomials[c][i] > rank:
+            c -= 1
+        combination.append(c)
+        rank -= binomials[c][i]
+    return tuple(reversed(combination))
+
+
+def _unrank_combinations(ranks, n, k, binomials):
+    """helper function that unranks many combinations at once;
+    the vectorized version of ``_unrank_combination``.
+
+    Parameters
+    ----------
+    ranks : numpy.ndarray
+        of int64, each in the range [0, C(n, k)).
+    n : int
+        number of elements to choose from.
+    k : int
+        number of elements in combination.
+    binomials : numpy.ndarray
+        table of binomial coefficients returned by ``_binomial_table(n, k)``,
+        converted to an array of int64.
+
+    Returns
+    -------
+    combinations : numpy.ndarray
+        of int, with shape (ranks.size, k). Each row is a combination,
+        in increasing order.
+    """
+    ranks = np.array(ranks, dtype=np.int64)
+    combinations = np.empty((ranks.size, k), dtype=int)
+    # transpose so that each column of the table is contiguous in memory
+    columns = np.ascontiguousarray(binomials[:n + 1].T)
+    for i in range(k, 0, -1):
+        # C(c, i) is non-decreasing in c, so we can find the largest c such that C(c, i) <= rank
+        # for all the ranks at once with a binary search down column i of the table
+        c = np.searchsorted(columns[i], ranks, side='right') - 1
+        combinations[:, i - 1] = c
+        ranks -= columns[i][c]
+    return combinations
+
+
+def _sample_ranks(num_combs, num_imgs):
+    """helper function that samples ``num_imgs`` unique ranks from ``range(num_combs)``,
+    in random order, without making a list of all the ranks.
+
+    Returns a numpy.ndarray of int64 if num_combs fits in an int64, and otherwise a list of Python ints.
+    """
+    if num_combs <= np.iinfo(np.int64).max:
+        if num_combs <= 4 * num_imgs:
+            # not many more ranks than we need, so a permutation of all of them is cheap
+            return np.random.permutation(num_combs)[:num_imgs].astype(np.int64)
+        # draw with replacement and then top up to replace any repeats.
+        # Since there are many more ranks than images, repeats are rare
+        ranks = np.empty(0, dtype=np.int64)
+        while ranks.size < num_imgs:
+            more_ranks = np.random.randint(num_combs, size=num_imgs - ranks.size, dtype=np.int64)
+            ranks = np.sort(np.concatenate((ranks, more_ranks)))
+            # sorted, so any repeats are next to each other
+            ranks = ranks[np.concatenate(([True], ranks[1:] != ranks[:-1]))]
+        # shuffle to get ranks in random order
+        np.random.shuffle(ranks)
+        return ranks
+    else:
+        # range is too big for int64 (or random.sample, since its length overflows);
+        # draw with replacement and throw out any (extremely unlikely) repeats
+        ranks = set()
+        while len(ranks) < num_imgs:
+            ranks.add(random.randrange(num_combs))
+        ranks = list(ranks)
+        random.shuffle(ranks)
+        return ranks
+
+
+def _sample_cell_combinations(num_cells, set_size, num_imgs):
+    """helper function that samples ``num_imgs`` unique combinations of ``set_size`` cells
+    from a grid with ``num_cells`` cells, returned as an array with shape (num_imgs, set_size)"""
+    # There can be far too many combinations to list (e.g. ~1.9e11 for set size 8 on a 10x10 grid)
+    # so instead we sample their ranks in the combinatorial number system and then "unrank" each one
+    num_combs = comb(num_cells, set_size, exact=True)
+    ranks = _sample_ranks(num_combs, num_imgs)
+    binomials = _binomial_table(num_cells, set_size)
+    if max(max(row) for row in binomials) <= np.iinfo(np.int64).max:
+        return _unrank_combinations(ranks, num_cells, set_size, np.array(binomials, dtype=np.int64))
+    else:
+        # some binomial coefficients overflow int64, so unrank with Python ints
+        cells = [_unrank_combination(int(rank), num_cells, set_size, binomials) for rank in ranks]
+        return np.array(cells, dtype=int).reshape(num_imgs, set_size)
+
+
 def _generate_xx_and_yy(set_size,
                         num_imgs,
                         stim_maker):
@@ -20,25 +154,37 @@ def _generate_xx_and_yy(set_size,
     ensures that there are no repeated images in dataset
 
     finds number of combinations of cells given set size of stimulus and grid size specified for it
+
+    Returns
+    -------
+    all_cells_to_use : numpy.ndarray
+        of int, cells used by each image, in increasing order
+    all_xx_to_use_ctr : numpy.ndarray
+        of int, x co-ordinates of centers of items
+    all_yy_to_use_ctr : numpy.ndarray
+        of int, y co-ordinates of centers of items.
+        All have shape (num_imgs, set_size), so row i is the placement for image i.
     """
-    # get all combinations of cells (combination because order doesn't matter, just which cells get used)
+    # we use combinations of cells (combination because order doesn't matter, just which cells get used)
     # a cell combination is an unordered set of k cells from a grid with a total of n cells
     # e.g. if there are 25 cells in a 5x5 grid and you want all combinations k=1, then the
     # cell_combs will be [(0,), (1,), (2,), ... (24,)] (representing each as a tuple)
     # and all combinations k=2 will be [(0,1), (0,2), (0,3), ... (1,2), (1,3), ... (23, 24)]
     # (there are no repeats; once we draw a cell we don't replace it since we just put one item in each cell)
-    cell_combs = list(combinations(iterable=range(stim_maker.num_cells), r=set_size))
+    num_combs = comb(stim_maker.num_cells, set_size, exact=True)
 
     # if there are less combinations then there are number of images, we need to make sure we make jitter
     # unique so we don't get any repeat images
-    if len(cell_combs) < num_imgs:
+    if num_combs < num_imgs:
+        # there are fewer combinations than images, so it's fine to list them all
+        cell_combs = np.array(list(combinations(iterable=range(stim_maker.num_cells), r=set_size)),
+                              dtype=int).reshape(num_combs, set_size)
         # num_repeat: maximum number of times we might use any given cell combination
-        num_repeat = ceil(num_imgs / len(cell_combs))
+        num_repeat = ceil(num_imgs / num_combs)
         make_jitter_unique = True
     else:
-        # don't need to repeat any cell combinations; let's just sample without replacement
-        all_cells_to_use = random.sample(population=cell_combs, k=num_imgs)
-        num_repeat = 0
+        # don't need to repeat any cell combinations; let's just sample without replacement.
+        all_cells_to_use = _sample_cell_combinations(stim_maker.num_cells, set_size, num_imgs)
         make_jitter_unique = False
 
     # if jitter > 0, compute 'jitter_range'
@@ -55,80 +201,255 @@ def _generate_xx_and_yy(set_size,
                 jitter_low += 1
             elif coin_flip == 1:
                 jitter_high -= 1
-        jitter_range = range(jitter_low, jitter_high + 1)
-        # get cartesian product of jitter range of length 2, i.e. all x-y co-ordinates
+        jitter_range = np.arange(jitter_low, jitter_high + 1)
+        # all x-y jitters are the cartesian product of the jitter range with itself.
         # here we want cartesian product because order does matter, jitter of (1,0) != (0, 1)
-        # and because we want repeats, e.g. (2, 2)
-        jitter_coords = list(product(jitter_range, repeat=2))
+        # and because we want repeats, e.g. (2, 2). We just index into the product, so jitter
+        # number j is (y, x) = (jitter_range[j // len(jitter_range)], jitter_range[j % len(jitter_range)])
+        num_jitter_coords = jitter_range.size ** 2
 
         if make_jitter_unique:
             # get each unique pairing of possible cell combinations and possible x, y jitters
-            if len(cell_combs) * len(jitter_coords) < num_imgs:
+            if num_combs * num_jitter_coords < num_imgs:
                 raise ValueError('cannot generate unique x and y co-ordinates for items in number of images specified; '
-                                 f'the product of the number of cell combinations {len(all_cells_to_use)} and the '
-                                 f'possible jitter added {len(jitter_coords)} is {len(cell_combs) * len(jitter_coords)}'
+                                 f'the product of the number of cell combinations {num_combs} and the '
+                                 f'possible jitter added {num_jitter_coords} is {num_combs * num_jitter_coords}'
                                  f', but the number of images to generate is {num_imgs}')
             else:
-                cell_and_jitter = []
-                for this_cell_comb in cell_combs:
-                    jitter_sample = random.sample(population=jitter_coords, k=num_repeat)
-                    this_cell_comb_with_jitter = [(this_cell_comb, jitter_coord_tup)
-                                                  for jitter_coord_tup in jitter_sample]
-                    cell_and_jitter.extend(this_cell_comb_with_jitter)
-                diff = len(cell_and_jitter) - num_imgs
+                # for each cell combination, sample num_repeat jitters without replacement,
+                # by sorting random keys
+                jitter_inds = np.argsort(np.random.random_sample((num_combs, num_jitter_coords)),
+                                         axis=1)[:, :num_repeat].ravel()
+                comb_inds = np.repeat(np.arange(num_combs), num_repeat)
                 # remove extras randomly instead of removing all from the last cell_comb
-                inds_to_remove = random.sample(range(len(cell_and_jitter)), k=diff)
-                inds_to_remove.sort(reverse=True)
-                for ind in inds_to_remove:
-                    cell_and_jitter.pop(ind)
-                all_cells_to_use = [cj_tup[0] for cj_tup in cell_and_jitter]
+                diff = comb_inds.size - num_imgs
+                inds_to_remove = np.random.choice(comb_inds.size, size=diff, replace=False)
+                comb_inds = np.delete(comb_inds, inds_to_remove)
+                jitter_inds = np.delete(jitter_inds, inds_to_remove)
+                all_cells_to_use = cell_combs[comb_inds]
         else:
-            jitter_rand = random.choices(jitter_coords, k=len(all_cells_to_use))
-            cell_and_jitter = zip(all_cells_to_use, jitter_rand)
+            jitter_inds = np.random.randint(num_jitter_coords, size=num_imgs)
+        y_jitter = jitter_range[jitter_inds // jitter_range.size]
+        x_jitter = jitter_range[jitter_inds % jitter_range.size]
     else:  # if jitter == 0
-        jitter_none = [None] * len(all_cells_to_use)
-        cell_and_jitter = zip(all_cells_to_use, jitter_none)
+        if make_jitter_unique:
+            raise ValueError('cannot generate unique x and y co-ordinates for items in number of images specified; '
+                             f'the number of cell combinations {num_combs} is less than the number of '
+                             f'images to generate, {num_imgs}, and there is no jitter')
+        y_jitter = x_jitter = np.zeros(num_imgs, dtype=int)
 
     ###########################################################################
     # notice: below we always refer to y before x, because shapes are         #
     # specified in order of (height, width). So size[0] = y and size[1] = x   #
     ###########################################################################
-    all_yy_to_use_ctr = []
-    all_xx_to_use_ctr = []
-    for cells_to_use, jitter_to_add in cell_and_jitter:
-        # need to cast to list and then array because converting a list with asarray returns a 1-dimensional
-        # array, and indexing with this one-dimensional array returns another 1-d array. Using just a tuple
-        # or an array made from a tuple will just return a single element when the tuple has only one element,
-        # and this will raise an error when that one element is passed to stim_maker instead of a 1-d, 1 element
-        # array
-        cells_to_use = np.asarray(list(cells_to_use))
-        yy_to_use = stim_maker.yy[cells_to_use]
-        xx_to_use = stim_maker.xx[cells_to_use]
-
-        # find centers of cells we're going to use
-        yy_to_use_ctr = (yy_to_use * stim_maker.cell_height) - stim_maker.cell_y_center
-        xx_to_use_ctr = (xx_to_use * stim_maker.cell_width) - stim_maker.cell_x_center
-
-        if stim_maker.border_size:
-            yy_to_use_ctr += round(stim_maker.border_size[0] / 2)
-            xx_to_use_ctr += round(stim_maker.border_size[1] / 2)
-
-        if jitter_to_add:
-            yy_to_use_ctr += jitter_to_add[0]
-            xx_to_use_ctr += jitter_to_add[1]
-
-        all_yy_to_use_ctr.append(yy_to_use_ctr)
-        all_xx_to_use_ctr.append(xx_to_use_ctr)
+    # find centers of cells we're going to use, and add the same jitter to all items in an image
+    all_yy_to_use_ctr = stim_maker.cell_yy_ctr[all_cells_to_use]
+    all_yy_to_use_ctr += y_jitter[:, np.newaxis]
+    all_xx_to_use_ctr = stim_maker.cell_xx_ctr[all_cells_to_use]
+    all_xx_to_use_ctr += x_jitter[:, np.newaxis]
 
     return all_cells_to_use, all_xx_to_use_ctr, all_yy_to_use_ctr
 
 
+# maximum number of images in a shard of work handed to a worker process
+MAX_SHARD_SIZE = 1000
+
+
+class _Shard(NamedTuple):
+    """a shard of work for ``make``: a run of images that all have the same
+    stimulus, set size, and target condition, along with their placements"""
+    stimulus: str
+    set_size: int
+    target_condition: str
+    num_target: int
+    img_nums: list
+    all_cells_to_use: list
+    all_xx_to_use_ctr: list
+    all_yy_to_use_ctr: list
+    seed: int
+
+
+def _split_into_shards(stimulus,
+                       set_size,
+                       target_condition,
+                       num_target,
+                       img_nums,
+                       all_cells_to_use,
+                       all_xx_to_use_ctr,
+                       all_yy_to_use_ctr,
+                       num_workers):
+    """helper function that splits the images for one combination of stimulus,
+    set size, and target condition into shards that can be made independently
+
+    When there is more than one worker, each shard gets a seed, drawn here
+    from the random state of the parent process. Workers use it to re-seed
+    their random number generators before making stimuli, so that
+    different workers do not all draw the same random numbers.
+    """
+    num_imgs = len(img_nums)
+    if num_imgs == 0:
+        return []
+
+    shard_size = min(ceil(num_imgs / num_workers), MAX_SHARD_SIZE)
+    shards = []
+    for start in range(0, num_imgs, shard_size):
+        stop = start + shard_size
+        if num_workers > 1:
+            seed = int(np.random.randint(2 ** 32, dtype=np.uint32))
+        else:
+            seed = None
+        shards.append(
+            _Shard(stimulus=stimulus,
+                   set_size=set_size,
+                   target_condition=target_condition,
+                   num_target=num_target,
+                   img_nums=img_nums[start:stop],
+                   all_cells_to_use=all_cells_to_use[start:stop],
+                   all_xx_to_use_ctr=all_xx_to_use_ctr[start:stop],
+                   all_yy_to_use_ctr=all_yy_to_use_ctr[start:stop],
+                   seed=seed)
+        )
+    return shards
+
+
+def _make_and_save_stim(stim_maker,
+                        stimulus,
+                        set_size,
+                        target_condition,
+                        num_target,
+                        img_num,
+                        root_output_dir,
+                        cells_to_use=None,
+                        xx_to_use_ctr=None,
+                        yy_to_use_ctr=None):
+    """helper function to make and save individual stim
+
+    Returns
+    -------
+    row : tuple
+        with values for each field in the .csv made by ``make``
+    """
+    rect_tuple = stim_maker.make_stim(set_size=set_size,
+                                      num_target=num_target,
+                                      cells_to_use=cells_to_use,
+                                      xx_to_use_ctr=xx_to_use_ctr,
+                                      yy_to_use_ctr=yy_to_use_ctr)
+
+    target_condition_dir = root_output_dir.joinpath(stimulus, str(set_size), target_condition)
+    filename = (
+        f'{stimulus}_set_size_{set_size}_target_{target_condition}'
+        f'_{img_num}.png'
+    )
+    abs_path_filename = target_condition_dir.joinpath(filename)
+    pygame.image.save(rect_tuple.display_surface,
+                      str(abs_path_filename))
+    # use relative path for name of file in csv
+    # so it won't break anything if we move the whole directory of images
+    # we can just change 'root_output_dir' instead
+    img_file = Path(stimulus).joinpath(str(set_size),
+                                       target_condition,
+                                       filename)
+    meta_file = Path(
+        str(abs_path_filename).replace('.png', '.meta.json')
+    )
+    meta_dict = {
+        'img_file': str(img_file),
+        'target_indices': rect_tuple.target_indices,
+        'distractor_indices': rect_tuple.distractor_indices,
+        'grid_as_char': rect_tuple.grid_as_char,
+    }
+    with open(meta_file, 'w') as fp:
+        json.dump(meta_dict, fp)
+
+    voc_writer = Writer(
+        path=abs_path_filename,
+        width=stim_maker.window_size[1],
+        height=stim_maker.window_size[0],
+    )
+    for voc_object in rect_tuple.voc_objects:
+        voc_writer.add_object(
+            name=voc_object.name,
+            xmin=voc_object.xmin,
+            ymin=voc_object.ymin,
+            xmax=voc_object.xmax,
+            ymax=voc_object.ymax,
+        )
+    xml_filename = filename.replace('png', 'xml')
+    voc_writer.save(
+        annotation_path=target_condition_dir / xml_filename
+    )
+    # use relative path for name of file in csv, as above for img_file
+    xml_file = Path(stimulus).joinpath(str(set_size),
+                                       target_condition,
+                                       xml_filename)
+
+    row = (stimulus,
+           set_size,
+           target_condition,
+           img_num,
+           root_output_dir,
+           img_file,
+           xml_file,
+           meta_file)
+    return row
+
+
+def _make_shard(shard, stim_dict, root_output_dir):
+    """make and save all the stimuli in a shard
+
+    Returns
+    -------
+    rows : list
+        of tuples, one for each stimulus, in the order of ``shard.img_nums``
+    """
+    if shard.seed is not None:
+        random.seed(shard.seed)
+        np.random.seed(shard.seed)
+
+    stim_maker = stim_dict[shard.stimulus]
+    rows = []
+    for img_num, cells_to_use, xx_to_use_ctr, yy_to_use_ctr in zip(shard.img_nums,
+                                                                   shard.all_cells_to_use,
+                                                                   shard.all_xx_to_use_ctr,
+                                                                   shard.all_yy_to_use_ctr):
+        rows.append(
+            _make_and_save_stim(stim_maker,
+                                shard.stimulus,
+                                shard.set_size,
+                                shard.target_condition,
+                                shard.num_target,
+                                img_num,
+                                root_output_dir,
+                                cells_to_use,
+                                xx_to_use_ctr,
+                                yy_to_use_ctr)
+        )
+    return rows
+
+
+# state of each worker process, set once by ``_init_worker``
+# so the stim makers aren't pickled again for every shard
+_WORKER_STATE = {}
+
+
+def _init_worker(stim_dict, root_output_dir):
+    """initializer for worker processes used by ``make``"""
+    _WORKER_STATE['stim_dict'] = stim_dict
+    _WORKER_STATE['root_output_dir'] = root_output_dir
+
+
+def _make_shard_in_worker(shard):
+    """make a shard in a worker process, using state set by ``_init_worker``"""
+    return _make_shard(shard, _WORKER_STATE['stim_dict'], _WORKER_STATE['root_output_dir'])
+
+
 def make(root_output_dir,
          stim_dict,
          csv_filename,
          num_target_present,
          num_target_absent,
-         set_sizes):
+         set_sizes,
+         num_workers=1):
     """make visual search stimuli given an output directory and a set of StimMaker classes
 
     Parameters
@@ -158,6 +479,13 @@ def make(root_output_dir,
         number of stimuli generated for that set size. E.g. if num_target_present = [1000, 2000, 4000] and
         set_sizes = [1, 2, 4] then there will be 1000 stimuli with set size 1, 2000 with set size 2, and 4000
         with set size 4.
+    num_workers : int
+        number of processes used to make stimuli. Default is 1, in which case
+        all stimuli are made in the current process. If greater than 1,
+        placements of items are computed first, and then stimuli are
+        made and saved in shards by a pool of worker processes.
+        The .csv file is the same as would be made by a serial run,
+        with the same ``img_num`` values.
 
     Returns
     -------
@@ -264,6 +592,16 @@ def make(root_output_dir,
                 'all values in num_target_absent should be int'
             )
 
+    if type(num_workers) != int:
+        raise TypeError(
+            f'num_workers should be int but type was: {type(num_workers)}'
+        )
+
+    if num_workers < 1:
+        raise ValueError(
+            f'num_workers must be greater than or equal to 1 but was: {num_workers}'
+        )
+
     if type(root_output_dir) == str:
         root_output_dir = Path(root_output_dir)
 
@@ -272,9 +610,9 @@ def make(root_output_dir,
 
     root_output_dir = root_output_dir.absolute()
 
-    # for csv
-    rows = []
-
+    # first make all the directories and compute placements for every image,
+    # so that stimuli can then be rendered in any order (e.g., by parallel workers)
+    shards = []
     for stimulus, stim_maker in stim_dict.items():
         stimulus_output_dir = root_output_dir.joinpath(stimulus)
         if not stimulus_output_dir.is_dir():
@@ -309,80 +647,9 @@ def make(root_output_dir,
                 if not target_condition_dir.is_dir():
                     target_condition_dir.mkdir()
 
-                def _make_stim(img_num,
-                               cells_to_use=None,
-                               xx_to_use_ctr=None,
-                               yy_to_use_ctr=None):
-                    """helper function to make and save individual stim
-
-                    Define as a nested function so we can avoid repeating ourselves below
-                    """
-                    rect_tuple = stim_maker.make_stim(set_size=set_size,
-                                                      num_target=num_target,
-                                                      cells_to_use=cells_to_use,
-                                                      xx_to_use_ctr=xx_to_use_ctr,
-                                                      yy_to_use_ctr=yy_to_use_ctr)
-
-                    filename = (
-                        f'{stimulus}_set_size_{set_size}_target_{target_condition}'
-                        f'_{img_num}.png'
-                    )
-                    abs_path_filename = target_condition_dir.joinpath(filename)
-                    pygame.image.save(rect_tuple.display_surface,
-                                      str(abs_path_filename))
-                    # use relative path for name of file in csv
-                    # so it won't break anything if we move the whole directory of images
-                    # we can just change 'root_output_dir' instead
-                    img_file = Path(stimulus).joinpath(str(set_size),
-                                                       target_condition,
-                                                       filename)
-                    meta_file = Path(
-                        str(abs_path_filename).replace('.png', '.meta.json')
-                    )
-                    meta_dict = {
-                        'img_file': str(img_file),
-                        'target_indices': rect_tuple.target_indices,
-                        'distractor_indices': rect_tuple.distractor_indices,
-                        'grid_as_char': rect_tuple.grid_as_char,
-                    }
-                    with open(meta_file, 'w') as fp:
-                        json.dump(meta_dict, fp)
-
-                    voc_writer = Writer(
-                        path=abs_path_filename,
-                        width=stim_maker.window_size[1],
-                        height=stim_maker.window_size[0],
-                    )
-                    for voc_object in rect_tuple.voc_objects:
-                        voc_writer.add_object(
-                            name=voc_object.name,
-                            xmin=voc_object.xmin,
-                            ymin=voc_object.ymin,
-                            xmax=voc_object.xmax,
-                            ymax=voc_object.ymax,
-                        )
-                    xml_filename = filename.replace('png', 'xml')
-                    voc_writer.save(
-                        annotation_path=target_condition_dir / xml_filename
-                    )
-                    # use relative path for name of file in csv, as above for img_file
-                    xml_file = Path(stimulus).joinpath(str(set_size),
-                                                       target_condition,
-                                                       xml_filename)
-
-                    row = (stimulus,
-                           set_size,
-                           target_condition,
-                           img_num,
-                           root_output_dir,
-                           img_file,
-                           xml_file,
-                           meta_file)
-                    rows.append(row)
-
                 if stim_maker.grid_size is None:
-                    for img_num in img_nums:
-                        _make_stim(img_num)
+                    # items are placed randomly when each stimulus is made
+                    all_cells_to_use = all_xx_to_use_ctr = all_yy_to_use_ctr = [None] * len(img_nums)
                 else:
                     (all_cells_to_use,
                      all_xx_to_use_ctr,
@@ -390,11 +657,36 @@ def make(root_output_dir,
                                                               num_imgs=len(img_nums),
                                                               stim_maker=stim_maker)
 
-                    for img_num, cells_to_use, xx_to_use_ctr, yy_to_use_ctr in zip(img_nums,
-                                                                                   all_cells_to_use,
-                                                                                   all_xx_to_use_ctr,
-                                                                                   all_yy_to_use_ctr):
-                        _make_stim(img_num, cells_to_use, xx_to_use_ctr, yy_to_use_ctr)
+                shards.extend(
+                    _split_into_shards(stimulus,
+                                       set_size,
+                                       target_condition,
+                                       num_target,
+                                       img_nums,
+                                       all_cells_to_use,
+                                       all_xx_to_use_ctr,
+                                       all_yy_to_use_ctr,
+                                       num_workers)
+                )
+
+    # for csv
+    rows = []
+
+    if num_workers == 1:
+        for shard in shards:
+            rows.extend(
+                _make_shard(shard, stim_dict, root_output_dir)
+            )
+    else:
+        # use 'spawn' so workers don't inherit pygame / SDL state from this process
+        with ProcessPoolExecutor(max_workers=num_workers,
+                                 mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_worker,
+                                 initargs=(stim_dict, root_output_dir)) as executor:
+            # map returns results in the order shards were submitted,
+            # so rows end up in the same order as they would for a serial run
+            for shard_rows in executor.map(_make_shard_in_worker, shards):
+                rows.extend(shard_rows)
 
     csv_filename = root_output_dir.joinpath(csv_filename)
     make_csv(rows, csv_filename)
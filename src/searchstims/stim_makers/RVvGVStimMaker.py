@@ -1,6 +1,8 @@
+import numpy as np
 import pygame
 
 from .abstract_stim_maker import AbstractStimMaker
+from .rasterize import fill_rects, item_bboxes, new_images, to_rgb
 
 
 class RVvGVStimMaker(AbstractStimMaker):
@@ -31,3 +33,49 @@ class RVvGVStimMaker(AbstractStimMaker):
         rect_to_draw.left = rect_to_draw.left + width
 
         pygame.draw.rect(display_surface, color, rect_to_draw)
+
+    def rasterize(self, xx_to_use_ctr, yy_to_use_ctr, voc_names, out=None):
+        """Draws a batch of stimuli with NumPy instead of pygame.
+
+        Gives the same pixels as ``make_stim`` does
+        for items with the same centers and names.
+
+        Parameters
+        ----------
+        xx_to_use_ctr : numpy.ndarray
+            co-ordinates of center of item bounding boxes on x axis,
+            with shape (num_imgs, set_size).
+        yy_to_use_ctr : numpy.ndarray
+            co-ordinates of center of item bounding boxes on y axis,
+            with shape (num_imgs, set_size).
+        voc_names : numpy.ndarray
+            of str, with shape (num_imgs, set_size).
+            Name of each item: 't' for target, 'd' for distractor.
+        out : numpy.ndarray
+            of uint8, with shape (num_imgs, height, width, 3).
+            Array to draw images into, e.g. a slice of a memory-mapped array.
+            Default is None, in which case a new array is allocated.
+
+        Returns
+        -------
+        images : numpy.ndarray
+            of uint8, with shape (num_imgs, height, width, 3).
+        bboxes : numpy.ndarray
+            of int, with shape (num_imgs, set_size, 4).
+            (xmin, ymin, xmax, ymax) of each rectangle drawn,
+            the same as the boxes of the VOCObjects returned by ``make_stim``.
+        """
+        left, top = item_bboxes(xx_to_use_ctr, yy_to_use_ctr, self.item_bbox_size)
+        width = self.item_bbox_size[1] // 3
+        left = left + width
+        height = self.item_bbox_size[0]
+
+        is_target = np.asarray(voc_names) == 't'
+        colors = np.where(is_target[..., np.newaxis],
+                          np.array(to_rgb(self.target_color), dtype=np.uint8),
+                          np.array(to_rgb(self.distractor_color), dtype=np.uint8))
+
+        images = new_images(left.shape[0], self.window_size, self.background_color, out)
+        fill_rects(images, left, top, width, height, colors)
+        bboxes = np.stack([left, top, left + width, top + height], axis=-1)
+        return images, bboxes
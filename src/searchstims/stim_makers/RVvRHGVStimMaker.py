@@ -1,10 +1,12 @@
 import random
 
+import numpy as np
 import pygame
 from pygame.rect import Rect
 
 from .abstract_stim_maker import AbstractStimMaker
 from .abstract_stim_maker import colors_dict
+from .rasterize import fill_rects, item_bboxes, new_images, to_rgb
 from ..voc import VOCObject
 
 
@@ -61,35 +63,20 @@ class RVvRHGVStimMaker(AbstractStimMaker):
             item_bbox.center = center
 
             if item in target_inds:
-                color = self.target_color
-                rotate = False
                 target_indices.append(center)
                 if self.grid_size:
                     grid_as_char[cells_to_use[item]] = 't'
                 voc_name = 't'
             else:
                 orientation = distractor_orientation.pop()
-                if orientation == 'V':
-                    color = self.distractor_color
-                    rotate = False
-                    voc_name = 'dV'
-                elif orientation == 'H':
-                    color = self.target_color
-                    rotate = True
-                    voc_name = 'dH'
+                voc_name = 'd' + orientation
 
                 distractor_indices.append(center)
                 if self.grid_size:
                     grid_as_char[cells_to_use[item]] = orientation
                     # instead of 'd', so we know which distractor is which
 
-            if type(color) == str:
-                color = colors_dict[color]
-
-            self.draw_item(display_surface=display_surface,
-                           item_bbox=item_bbox,
-                           color=color,
-                           rotate=rotate)
+            self._draw_voc_item(display_surface, item_bbox, voc_name)
 
             voc_objects.append(
                 VOCObject.from_rect(rect=item_bbox, voc_name=voc_name)
@@ -97,6 +84,31 @@ class RVvRHGVStimMaker(AbstractStimMaker):
 
         return grid_as_char, target_indices, distractor_indices, voc_objects
 
+    def _voc_labels(self, is_target):
+        """half of distractors are vertical rectangles in distractor color ('dV'),
+        and half are horizontal rectangles in target color ('dH')"""
+        return self._split_distractor_labels(is_target, 'dV', 'dH')
+
+    def _draw_voc_item(self, display_surface, item_bbox, voc_name):
+        """draw target ('t'), vertical distractor ('dV') or horizontal distractor ('dH')"""
+        if voc_name == 't':
+            color = self.target_color
+            rotate = False
+        elif voc_name == 'dV':
+            color = self.distractor_color
+            rotate = False
+        elif voc_name == 'dH':
+            color = self.target_color
+            rotate = True
+
+        if type(color) == str:
+            color = colors_dict[color]
+
+        self.draw_item(display_surface=display_surface,
+                       item_bbox=item_bbox,
+                       color=color,
+                       rotate=rotate)
+
     def draw_item(self, display_surface, item_bbox, color, rotate):
         """Draws a vertical rectangle that is 1/3 the width of the item bounding box.
 
@@ -126,3 +138,55 @@ class RVvRHGVStimMaker(AbstractStimMaker):
             rect_to_draw.left = rect_to_draw.left + width
 
         pygame.draw.rect(display_surface, color, rect_to_draw)
+
+    def rasterize(self, xx_to_use_ctr, yy_to_use_ctr, voc_names, out=None):
+        """Draws a batch of stimuli with NumPy instead of pygame.
+
+        Gives the same pixels as ``make_stim`` does
+        for items with the same centers and names.
+
+        Parameters
+        ----------
+        xx_to_use_ctr : numpy.ndarray
+            co-ordinates of center of item bounding boxes on x axis,
+            with shape (num_imgs, set_size).
+        yy_to_use_ctr : numpy.ndarray
+            co-ordinates of center of item bounding boxes on y axis,
+            with shape (num_imgs, set_size).
+        voc_names : numpy.ndarray
+            of str, with shape (num_imgs, set_size). Name of each item:
+            't' for target, 'dV' for vertical distractor in distractor color,
+            'dH' for horizontal distractor in target color.
+        out : numpy.ndarray
+            of uint8, with shape (num_imgs, height, width, 3).
+            Array to draw images into, e.g. a slice of a memory-mapped array.
+            Default is None, in which case a new array is allocated.
+
+        Returns
+        -------
+        images : numpy.ndarray
+            of uint8, with shape (num_imgs, height, width, 3).
+        bboxes : numpy.ndarray
+            of int, with shape (num_imgs, set_size, 4).
+            (xmin, ymin, xmax, ymax) of each rectangle drawn,
+            the same as the boxes of the VOCObjects returned by ``make_stim``.
+        """
+        left, top = item_bboxes(xx_to_use_ctr, yy_to_use_ctr, self.item_bbox_size)
+        bbox_height, bbox_width = self.item_bbox_size
+
+        voc_names = np.asarray(voc_names)
+        rotate = voc_names == 'dH'
+        # same geometry as draw_item
+        left = np.where(rotate, left, left + bbox_width // 3)
+        top = np.where(rotate, top + bbox_height // 3, top)
+        width = np.where(rotate, bbox_width, bbox_width // 3)
+        height = np.where(rotate, bbox_height // 3, bbox_height)
+
+        colors = np.where((voc_names == 'dV')[..., np.newaxis],
+                          np.array(to_rgb(self.distractor_color), dtype=np.uint8),
+                          np.array(to_rgb(self.target_color), dtype=np.uint8))
+
+        images = new_images(left.shape[0], self.window_size, self.background_color, out)
+        fill_rects(images, left, top, width, height, colors)
+        bboxes = np.stack([left, top, left + width, top + height], axis=-1)
+        return images, bboxes
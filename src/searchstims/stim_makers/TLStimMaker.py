@@ -1,19 +1,16 @@
-from pathlib import Path
 import random
 
-import pygame
 from pygame.rect import Rect
 
 from .abstract_stim_maker import AbstractStimMaker
 from .abstract_stim_maker import colors_dict
+from .sprites import FORCEDSQUARE_PATH, sprite_cache
 from ..voc import VOCObject
 
-THIS_FILE_DIR = Path(__file__).parent
-
 
 class TLStimMaker(AbstractStimMaker):
 
-    forcedsquare_path = str(THIS_FILE_DIR.joinpath('..', 'ttf', 'forced_square.ttf'))
+    forcedsquare_path = FORCEDSQUARE_PATH
 
     """Make visual search stimuli with T and L shapes, where target T is rotated 90 degrees.
     Distractors can be same or different colors."""
@@ -94,46 +91,18 @@ class TLStimMaker(AbstractStimMaker):
             item_bbox.center = center
 
             if item in target_inds:
-                is_target = True
-                color = self.target_T_color
                 target_indices.append(center)
                 if self.grid_size:
                     grid_as_char[cells_to_use[item]] = 't'
                 voc_name = 't'
             else:
-                is_target = False
                 distractor_letter = distractor_letters.pop()
-                if distractor_letter == 'T':
-                    color = self.distractor_T_color
-                    voc_name = 'dT'
-                elif distractor_letter == 'L':
-                    color = self.distractor_L_color
-                    voc_name = 'dL'
+                voc_name = 'd' + distractor_letter
                 distractor_indices.append(center)
                 if self.grid_size:
                     grid_as_char[cells_to_use[item]] = distractor_letter
 
-            if type(color) == str:
-                color = colors_dict[color]
-
-            font_obj = pygame.font.Font(self.forcedsquare_path, 64)
-            if is_target:
-                text_surface_obj = font_obj.render('T', True, color)
-            else:
-                text_surface_obj = font_obj.render(distractor_letter, True, color)
-            text_surface_obj = pygame.transform.scale(text_surface_obj,
-                                                      (self.item_bbox_size[1], self.item_bbox_size[0]))
-            if is_target:
-                # rotate AFTER scaling (so same aspect ratio as un-rotated T)
-                text_surface_obj = pygame.transform.rotate(text_surface_obj, self.target_rotation)
-            else:
-                if self.distractor_rotation > 0:
-                    if random.uniform(0, 1) > 0.5:
-                        text_surface_obj = pygame.transform.rotate(text_surface_obj, self.distractor_rotation)
-
-            self.draw_item(display_surface=display_surface,
-                           item_bbox=item_bbox,
-                           to_blit=text_surface_obj)
+            self._draw_voc_item(display_surface, item_bbox, voc_name)
 
             voc_objects.append(
                 VOCObject.from_rect(rect=item_bbox, voc_name=voc_name)
@@ -141,6 +110,41 @@ class TLStimMaker(AbstractStimMaker):
 
         return grid_as_char, target_indices, distractor_indices, voc_objects
 
+    def _voc_labels(self, is_target):
+        """half of distractors are T ('dT') and half are L ('dL')"""
+        return self._split_distractor_labels(is_target, 'dT', 'dL')
+
+    def _draw_voc_item(self, display_surface, item_bbox, voc_name):
+        """draw target T ('t'), distractor T ('dT') or distractor L ('dL').
+        Distractors are rotated by distractor_rotation half the time, at random"""
+        if voc_name == 't':
+            color = self.target_T_color
+            character = 'T'
+            rotation = self.target_rotation
+        else:
+            if voc_name == 'dT':
+                color = self.distractor_T_color
+            elif voc_name == 'dL':
+                color = self.distractor_L_color
+            character = voc_name[1]
+            rotation = 0
+            if self.distractor_rotation > 0:
+                if random.uniform(0, 1) > 0.5:
+                    rotation = self.distractor_rotation
+
+        if type(color) == str:
+            color = colors_dict[color]
+
+        text_surface_obj = sprite_cache.get(character,
+                                            color,
+                                            self.item_bbox_size,
+                                            rotation=rotation,
+                                            font_path=self.forcedsquare_path)
+
+        self.draw_item(display_surface=display_surface,
+                       item_bbox=item_bbox,
+                       to_blit=text_surface_obj)
+
     def draw_item(self, display_surface, item_bbox, to_blit):
         """Returns target or distractor"""
         display_surface.blit(to_blit, item_bbox)
@@ -1,18 +1,14 @@
-from pathlib import Path
-
-import pygame
 from pygame.rect import Rect
 
 from .abstract_stim_maker import AbstractStimMaker
 from .abstract_stim_maker import colors_dict
+from .sprites import FORCEDSQUARE_PATH, sprite_cache
 from ..voc import VOCObject
 
-THIS_FILE_DIR = Path(__file__).parent
-
 
 class TStimMaker(AbstractStimMaker):
 
-    forcedsquare_path = str(THIS_FILE_DIR.joinpath('..', 'ttf', 'forced_square.ttf'))
+    forcedsquare_path = FORCEDSQUARE_PATH
 
     """Make visual search stimuli with T shapes, where target is rotated 90 degrees."""
     def __init__(self,
@@ -59,34 +55,17 @@ class TStimMaker(AbstractStimMaker):
             item_bbox.center = center
 
             if item in target_inds:
-                is_target = True
-                color = self.target_color
                 target_indices.append(center)
                 if self.grid_size:
                     grid_as_char[cells_to_use[item]] = 't'
                 voc_name = 't'
             else:
-                is_target = False
-                color = self.distractor_color
                 distractor_indices.append(center)
                 if self.grid_size:
                     grid_as_char[cells_to_use[item]] = 'd'
                 voc_name = 'd'
 
-            if type(color) == str:
-                color = colors_dict[color]
-
-            font_obj = pygame.font.Font(self.forcedsquare_path, 64)
-            text_surface_obj = font_obj.render('T', True, color)
-            text_surface_obj = pygame.transform.scale(text_surface_obj,
-                                                      (self.item_bbox_size[1], self.item_bbox_size[0]))
-            if is_target:
-                # rotate AFTER scaling (so same aspect ratio as un-rotated T)
-                text_surface_obj = pygame.transform.rotate(text_surface_obj, self.target_rotation)
-
-            self.draw_item(display_surface=display_surface,
-                           item_bbox=item_bbox,
-                           to_blit=text_surface_obj)
+            self._draw_voc_item(display_surface, item_bbox, voc_name)
 
             voc_objects.append(
                 VOCObject.from_rect(rect=item_bbox, voc_name=voc_name)
@@ -94,6 +73,28 @@ class TStimMaker(AbstractStimMaker):
 
         return grid_as_char, target_indices, distractor_indices, voc_objects
 
+    def _draw_voc_item(self, display_surface, item_bbox, voc_name):
+        """draw rotated target T ('t') or upright distractor T ('d')"""
+        if voc_name == 't':
+            color = self.target_color
+            rotation = self.target_rotation
+        else:
+            color = self.distractor_color
+            rotation = 0
+
+        if type(color) == str:
+            color = colors_dict[color]
+
+        text_surface_obj = sprite_cache.get('T',
+                                            color,
+                                            self.item_bbox_size,
+                                            rotation=rotation,
+                                            font_path=self.forcedsquare_path)
+
+        self.draw_item(display_surface=display_surface,
+                       item_bbox=item_bbox,
+                       to_blit=text_surface_obj)
+
     def draw_item(self, display_surface, item_bbox, to_blit):
         """Returns target or distractor"""
         display_surface.blit(to_blit, item_bbox)
@@ -1,19 +1,15 @@
-from pathlib import Path
-
-import pygame
 from pygame.rect import Rect
 
 from .abstract_stim_maker import AbstractStimMaker
 from .abstract_stim_maker import colors_dict
+from .sprites import FORCEDSQUARE_PATH, sprite_cache
 from ..voc import VOCObject
 
-THIS_FILE_DIR = Path(__file__).parent
-
 
 class Two_v_Five_StimMaker(AbstractStimMaker):
     """Make visual search stimuli where the target is a digital 2
     and the distractors are digital 5s."""
-    forcedsquare_path = str(THIS_FILE_DIR.joinpath('..', 'ttf', 'forced_square.ttf'))
+    forcedsquare_path = FORCEDSQUARE_PATH
 
     def __init__(self,
                  target_number=2,
@@ -37,6 +33,27 @@ class Two_v_Five_StimMaker(AbstractStimMaker):
         """Returns target or distractor"""
         display_surface.blit(to_blit, item_bbox)
 
+    def _draw_voc_item(self, display_surface, item_bbox, voc_name):
+        """draw target number ('t') or distractor number ('d')"""
+        if voc_name == 't':
+            color = self.target_color
+            character = self.target_number
+        else:
+            color = self.distractor_color
+            character = self.distractor_number
+
+        if type(color) == str:
+            color = colors_dict[color]
+
+        text_surface_obj = sprite_cache.get(character,
+                                            color,
+                                            self.item_bbox_size,
+                                            font_path=self.forcedsquare_path)
+
+        self.draw_item(display_surface=display_surface,
+                       item_bbox=item_bbox,
+                       to_blit=text_surface_obj)
+
     def _make_stim(self,
                    xx_to_use_ctr,
                    yy_to_use_ctr,
@@ -62,37 +79,17 @@ class Two_v_Five_StimMaker(AbstractStimMaker):
             item_bbox.center = center
 
             if item in target_inds:
-                is_target = True
-                color = self.target_color
                 target_indices.append(center)
                 if self.grid_size:
                     grid_as_char[cells_to_use[item]] = 't'
                 voc_name = 't'
             else:
-                is_target = False
-                color = self.distractor_color
                 distractor_indices.append(center)
                 if self.grid_size:
                     grid_as_char[cells_to_use[item]] = 'd'
                 voc_name = 'd'
 
-            if type(color) == str:
-                color = colors_dict[color]
-
-            font_obj = pygame.font.Font(self.forcedsquare_path, 64)
-            if is_target:
-                text_surface_obj = font_obj.render(self.target_number,
-                                                   True, color)
-            else:
-                text_surface_obj = font_obj.render(self.distractor_number,
-                                                   True, color)
-            text_surface_obj = pygame.transform.scale(text_surface_obj,
-                                                      (self.item_bbox_size[1],
-                                                       self.item_bbox_size[0]))
-
-            self.draw_item(display_surface=display_surface,
-                           item_bbox=item_bbox,
-                           to_blit=text_surface_obj)
+            self._draw_voc_item(display_surface, item_bbox, voc_name)
 
             voc_objects.append(
                 VOCObject.from_rect(rect=item_bbox, voc_name=voc_name)
@@ -26,6 +26,11 @@ colors_dict = {
     'blue': (0, 0, 255),
 }
 
+# names of items used in annotations, e.g. 't' for target and 'd' for distractor.
+# Stim makers with more than one type of distractor use two-character names, e.g. 'dV' and 'dH'
+# for vertical and horizontal rectangles. The index of a name in this tuple is used as its label code
+VOC_NAMES = ('t', 'd', 'dV', 'dH', 'dT', 'dL', 'dx', 'do')
+
 MAX_DRAWS_INNER = 1000
 MAX_DRAWS_OUTER = 100
 
@@ -98,6 +103,16 @@ class AbstractStimMaker:
     cell_x_center
         co-ordinate of center of x axis of a cell. Add to co-ordinate of cell corner to
         get the center point of cell within the entire window.
+    cell_yy_ctr : numpy.ndarray
+        y co-ordinate of the center of each cell within the entire window,
+        including any offset due to the border, indexed by cell number.
+    cell_xx_ctr : numpy.ndarray
+        x co-ordinate of the center of each cell within the entire window,
+        including any offset due to the border, indexed by cell number.
+    headless : bool
+        if True, draw stimuli on an off-screen pygame.Surface owned by the stim maker,
+        instead of on the display surface returned by pygame.display.set_mode.
+        Default is True.
     """
 
     RectTuple = namedtuple('RectTuple', ['display_surface',
@@ -106,6 +121,12 @@ class AbstractStimMaker:
                                          'distractor_indices',
                                          'voc_objects'])
 
+    StimBatch = namedtuple('StimBatch', ['images',
+                                         'centers',
+                                         'bboxes',
+                                         'labels',
+                                         'cells'])
+
     def __init__(self,
                  target_color='red',
                  distractor_color='green',
@@ -115,7 +136,8 @@ class AbstractStimMaker:
                  grid_size=(5, 5),
                  min_center_dist=None,
                  item_bbox_size=(30, 30),
-                 jitter=5):
+                 jitter=5,
+                 headless=True):
         """__init__ function for Stim Makers
 
         Parameters
@@ -149,6 +171,11 @@ class AbstractStimMaker:
             same set size but slightly different placements, e.g. for
             augmenting data to train a learning algorithm and encourage
             invariant representations.
+        headless : bool
+            if True, draw stimuli on an off-screen pygame.Surface that is allocated
+            once and then re-used for every stimulus, instead of going through
+            pygame.display.set_mode and pygame.display.update. Does not require
+            a display driver. Default is True.
         """
         if grid_size is not None:
             if not all([type(grid_size_el) == int for grid_size_el in grid_size]):
@@ -169,6 +196,9 @@ class AbstractStimMaker:
         self.border_size = border_size
         self.item_bbox_size = item_bbox_size
         self.jitter = jitter
+        self.headless = headless
+        # off-screen surfaces used when headless, keyed by window size
+        self._surfaces = {}
 
         if self.grid_size:
             self.num_cells = self.grid_size[0] * self.grid_size[1]
@@ -193,6 +223,40 @@ class AbstractStimMaker:
             self.cell_width = round(self.grid_size_pixels[1] / self.grid_size[1])
             self.cell_x_center = round((self.grid_size_pixels[1] / self.grid_size[1]) / 2)
 
+            # look-up tables with the center of every cell, so the centers for any cells
+            # can be found just by indexing, e.g. self.cell_yy_ctr[cells_to_use]
+            self.cell_yy_ctr = (self.yy * self.cell_height) - self.cell_y_center
+            self.cell_xx_ctr = (self.xx * self.cell_width) - self.cell_x_center
+            if self.border_size:
+                self.cell_yy_ctr += round(self.border_size[0] / 2)
+                self.cell_xx_ctr += round(self.border_size[1] / 2)
+
+    def __getstate__(self):
+        # pygame.Surface instances can't be pickled, e.g. to send stim makers to worker processes,
+        # so drop them; they are re-allocated the first time they are needed
+        state = self.__dict__.copy()
+        state['_surfaces'] = {}
+        return state
+
+    def _get_display_surface(self):
+        """get surface that stimulus will be drawn on.
+
+        If ``self.headless`` is True, this is an off-screen surface
+        that is allocated the first time it is needed for ``self.window_size``
+        and then re-used. Otherwise it is the surface returned by
+        ``pygame.display.set_mode``.
+        """
+        # notice we are now using PyGame order of sizes, (width, height)
+        size = (self.window_size[1], self.window_size[0])
+        if self.headless:
+            display_surface = self._surfaces.get(size)
+            if display_surface is None:
+                display_surface = pygame.Surface(size, 0, 32)
+                self._surfaces[size] = display_surface
+        else:
+            display_surface = pygame.display.set_mode(size, 0, 32)
+        return display_surface
+
     def draw_item(self, display_surface, item_bbox, color=None, to_blit=None):
         """draw item for visual search stimulus
 
@@ -209,6 +273,75 @@ class AbstractStimMaker:
         """
         raise NotImplementedError
 
+    def _draw_voc_item(self, display_surface, item_bbox, voc_name):
+        """draw an item, given its name in the annotation, by calling self.draw_item
+
+        Sub-classes with more than one type of distractor override this
+        to draw the item that corresponds to each name.
+
+        Parameters
+        ----------
+        display_surface : pygame.Surface
+        item_bbox : pygame.Rect
+            item bounding box. The actual item is drawn
+            *within* this bounding box.
+        voc_name : str
+            name of item, one of VOC_NAMES, e.g. 't' for target.
+        """
+        if voc_name == 't':
+            color = self.target_color
+        else:
+            color = self.distractor_color
+
+        if type(color) == str:
+            color = colors_dict[color]
+
+        self.draw_item(display_surface=display_surface,
+                       item_bbox=item_bbox,
+                       color=color)
+
+    def _voc_labels(self, is_target):
+        """get label codes for items in a batch of stimuli, i.e. indices into VOC_NAMES
+
+        Sub-classes with more than one type of distractor override this
+        to assign a type to each distractor.
+
+        Parameters
+        ----------
+        is_target : numpy.ndarray
+            of bool, with shape (num_imgs, set_size). True for items that are targets.
+
+        Returns
+        -------
+        labels : numpy.ndarray
+            of int, with shape (num_imgs, set_size).
+        """
+        return np.where(is_target, VOC_NAMES.index('t'), VOC_NAMES.index('d'))
+
+    @staticmethod
+    def _split_distractor_labels(is_target, first_voc_name, second_voc_name):
+        """helper function for sub-classes with two types of distractor,
+        that assigns half the distractors in each stimulus to each type
+
+        If the number of distractors is odd, which type gets the extra one
+        is decided by a coin flip. Types are then shuffled among distractors.
+        """
+        num_imgs, set_size = is_target.shape
+        num_distractors = set_size - is_target.sum(axis=1)
+        num_first = num_distractors // 2 + np.random.randint(2, size=num_imgs) * (num_distractors % 2)
+
+        # rank distractors in random order within each stimulus; sort targets last
+        sort_keys = np.random.random_sample(is_target.shape)
+        sort_keys[is_target] = np.inf
+        ranks = np.argsort(np.argsort(sort_keys, axis=1), axis=1)
+        is_first = ranks < num_first[:, np.newaxis]
+
+        return np.where(is_target,
+                        VOC_NAMES.index('t'),
+                        np.where(is_first,
+                                 VOC_NAMES.index(first_voc_name),
+                                 VOC_NAMES.index(second_voc_name)))
+
     def _make_stim(self,
                    xx_to_use_ctr,
                    yy_to_use_ctr,
@@ -239,23 +372,16 @@ class AbstractStimMaker:
             item_bbox.center = center
 
             if item in target_inds:
-                color = self.target_color
                 target_indices.append(center)
                 voc_name = 't'
             else:
-                color = self.distractor_color
                 distractor_indices.append(center)
                 voc_name = 'd'
 
             if self.grid_size:
                 grid_as_char[cells_to_use[item]] = voc_name
 
-            if type(color) == str:
-                color = colors_dict[color]
-
-            self.draw_item(display_surface=display_surface,
-                           item_bbox=item_bbox,
-                           color=color)
+            self._draw_voc_item(display_surface, item_bbox, voc_name)
 
             voc_objects.append(
                 VOCObject.from_rect(rect=item_bbox, voc_name=voc_name)
@@ -263,6 +389,110 @@ class AbstractStimMaker:
 
         return grid_as_char, target_indices, distractor_indices, voc_objects
 
+    def _validate_set_size_and_num_target(self, set_size, num_target):
+        """helper function that validates arguments to make_stim and make_stims"""
+        if type(set_size) != int:
+            raise TypeError('set size must be an integer')
+
+        if not set_size > 0:
+            raise ValueError('set size must be greater than zero')
+
+        if type(num_target) != int:
+            raise TypeError('number of targets must be an integer')
+
+        if not num_target >= 0:
+            raise ValueError('number of targets must be greater than or equal to zero')
+
+        if num_target > set_size:
+            raise ValueError('number of targets cannot be greater than set size')
+
+        if self.grid_size is not None:
+            total_grid_elements = self.grid_size[0] * self.grid_size[1]
+            if set_size > total_grid_elements:
+                raise ValueError('set size {} cannot be greater than number of '
+                                 'elements in grid, {}'
+                                 .format(set_size, total_grid_elements))
+
+        if type(self.jitter) != int:
+            raise TypeError('value for jitter must be an integer')
+
+    def _draw_random_centers(self, set_size):
+        """draw center points of items at random, for stim makers without a grid,
+        so that all centers are at least self.min_center_dist apart
+
+        Returns
+        -------
+        xx_to_use_ctr : numpy.ndarray
+            co-ordinates of center of item bounding boxes on x axis.
+        yy_to_use_ctr : numpy.ndarray
+            co-ordinates of center of item bounding boxes on y axis.
+        """
+        if self.border_size:
+            yy = np.arange(self.border_size[0] + (self.item_bbox_size[0] / 2),
+                           self.window_size[0] - (self.border_size[0] + (self.item_bbox_size[0] / 2) + 1),
+                           dtype=int)
+            xx = np.arange(self.border_size[1] + (self.item_bbox_size[1] / 2),
+                           self.window_size[1] - (self.border_size[1] + (self.item_bbox_size[1] / 2) + 1),
+                           dtype=int)
+        else:
+            yy = np.arange(self.item_bbox_size[0] / 2,
+                           self.window_size[0] - (self.item_bbox_size[0] / 2))
+            xx = np.arange(self.item_bbox_size[1] / 2,
+                           self.window_size[1] - (self.item_bbox_size[1] / 2))
+
+        # draw center points at random
+        dists_are_good = False
+        less_than_set_size = True
+        draws_outer = 0
+        while dists_are_good is False:
+            draws_outer += 1
+            if draws_outer > MAX_DRAWS_OUTER:
+                raise ValueError('could not find suitable set of co-ordinates for set')
+
+            draws_inner = 0
+            coords_list = []
+
+            while less_than_set_size is True:
+                yy_to_use_ctr = np.random.choice(yy)
+                xx_to_use_ctr = np.random.choice(xx)
+                coord = [xx_to_use_ctr, yy_to_use_ctr]
+                draws_inner += 1
+                if draws_inner > MAX_DRAWS_INNER:
+                    coords_list = []
+                    draws_inner = 0
+
+                if len(coords_list) == 0:
+                    coords_list.append(coord)
+
+                    if set_size == 1:
+                        # then we're done actually
+                        less_than_set_size = False
+                        dists_are_good = True
+                        # make into an array of size (1,) to prevent crash when we index into them below
+                        yy_to_use_ctr = np.asarray([yy_to_use_ctr])
+                        xx_to_use_ctr = np.asarray([xx_to_use_ctr])
+                else:
+                    coords_list_tmp = list(coords_list)
+                    coords_list_tmp.append(coord)
+                    coords_list_tmp = np.stack(coords_list_tmp)
+                    dists = pdist(coords_list_tmp)
+
+                    if np.any(dists < self.min_center_dist):
+                        continue
+                    else:
+                        coords_list = coords_list_tmp.tolist()
+
+                        if len(coords_list) < set_size:
+                            continue
+                        else:
+                            coords = np.asarray(coords_list)
+                            yy_to_use_ctr = coords[:, 1]
+                            xx_to_use_ctr = coords[:, 0]
+                            dists_are_good = True
+                            less_than_set_size = False
+
+        return xx_to_use_ctr, yy_to_use_ctr
+
     def make_stim(self,
                   set_size=8,
                   num_target=1,
@@ -279,11 +509,13 @@ class AbstractStimMaker:
             Default is 8.
         num_target : int
             Number of targets. Default is 1.
-        cells_to_use : list
-            list of cells in grid to use. Length must equal set_size.
+        cells_to_use : list, numpy.ndarray
+            cells in grid to use. Length must equal set_size.
             Default is None, in which case cells are drawn randomly from
             grid defined for this stim maker. The centers of the cells of
-            the grid are accessible as stim_maker.xx and stim_maker.yy
+            the grid are accessible as stim_maker.cell_xx_ctr and stim_maker.cell_yy_ctr.
+            If cells_to_use is specified but xx_to_use_ctr and yy_to_use_ctr
+            are not, items are placed at the centers of those cells, plus jitter.
         xx_to_use_ctr : numpy.ndarray
             co-ordinates of center of item bounding boxes on x axis.
             One-dimensional vector; number of elements must equal set_size.
@@ -298,24 +530,13 @@ class AbstractStimMaker:
         Returns
         -------
         display_surface : pygame.Surface
-            with visual search stimuli plotted on it
+            with visual search stimuli plotted on it.
+            Note the same surface is drawn on again by the next call to make_stim,
+            so copy it if it needs to be kept.
         """
-        if type(set_size) != int:
-            raise TypeError('set size must be an integer')
-
-        if not set_size > 0:
-            raise ValueError('set size must be greater than zero')
-
-        if type(num_target) != int:
-            raise TypeError('number of targets must be an integer')
-
-        if not num_target >= 0:
-            raise ValueError('number of targets must be greater than or equal to zero')
+        self._validate_set_size_and_num_target(set_size, num_target)
 
-        if num_target > set_size:
-            raise ValueError('number of targets cannot be greater than set size')
-
-        if cells_to_use:
+        if cells_to_use is not None:
             if len(cells_to_use) != set_size:
                 raise ValueError(f'Number of elements in cells_to_use must equal set_size.\n'
                                  f'cells_to_use has length {len(cells_to_use)} but set_size is {set_size}.')
@@ -340,16 +561,6 @@ class AbstractStimMaker:
                 raise ValueError('Number of elements in yy_to_use_ctr must equal set size.'
                                  f'yy_to_use_ctr.shape is {yy_to_use_ctr.shape} and set size is {set_size}')
 
-        if self.grid_size is not None:
-            total_grid_elements = self.grid_size[0] * self.grid_size[1]
-            if set_size > total_grid_elements:
-                raise ValueError('set size {} cannot be greater than number of '
-                                 'elements in grid, {}'
-                                 .format(set_size, total_grid_elements))
-
-        if type(self.jitter) != int:
-            raise TypeError('value for jitter must be an integer')
-
         ###########################################################################
         # notice: below we always refer to y before x, because shapes are         #
         # specified in order of (height, width). So size[0] = y and size[1] = x   #
@@ -361,17 +572,10 @@ class AbstractStimMaker:
                                                            size=set_size,
                                                            replace=False))
 
-                    yy_to_use = self.yy[cells_to_use]
-                    xx_to_use = self.xx[cells_to_use]
-
+                if xx_to_use_ctr is None:
                     # find centers of cells we're going to use
-                    yy_to_use_ctr = (yy_to_use * self.cell_height) - self.cell_y_center
-
-                    xx_to_use_ctr = (xx_to_use * self.cell_width) - self.cell_x_center
-
-                    if self.border_size:
-                        yy_to_use_ctr += round(self.border_size[0] / 2)
-                        xx_to_use_ctr += round(self.border_size[1] / 2)
+                    yy_to_use_ctr = self.cell_yy_ctr[cells_to_use]
+                    xx_to_use_ctr = self.cell_xx_ctr[cells_to_use]
 
                     # add jitter to those points
                     jitter_high = self.jitter // 2
@@ -387,80 +591,17 @@ class AbstractStimMaker:
                             jitter_high -= 1
                     jitter_range = np.arange(jitter_low, jitter_high + 1)
 
-                    y_jitter = np.random.choice(jitter_range, size=yy_to_use.size)
-                    yy_to_use_ctr += y_jitter
-                    x_jitter = np.random.choice(jitter_range, size=xx_to_use.size)
-                    xx_to_use_ctr += x_jitter
+                    if jitter_range.size > 0:
+                        y_jitter = np.random.choice(jitter_range, size=yy_to_use_ctr.size)
+                        yy_to_use_ctr = yy_to_use_ctr + y_jitter
+                        x_jitter = np.random.choice(jitter_range, size=xx_to_use_ctr.size)
+                        xx_to_use_ctr = xx_to_use_ctr + x_jitter
 
             else:  # if self.grid_size is None
-                if self.border_size:
-                    yy = np.arange(self.border_size[0] + (self.item_bbox_size[0] / 2),
-                                   self.window_size[0] - (self.border_size[0] + (self.item_bbox_size[0] / 2) + 1),
-                                   dtype=int)
-                    xx = np.arange(self.border_size[1] + (self.item_bbox_size[1] / 2),
-                                   self.window_size[1] - (self.border_size[1] + (self.item_bbox_size[1] / 2) + 1),
-                                   dtype=int)
-                else:
-                    yy = np.arange(self.item_bbox_size[0] / 2,
-                                   self.window_size[0] - (self.item_bbox_size[0] / 2))
-                    xx = np.arange(self.item_bbox_size[1] / 2,
-                                   self.window_size[1] - (self.item_bbox_size[1] / 2))
-
-                # draw center points at random
-                dists_are_good = False
-                less_than_set_size = True
-                draws_outer = 0
-                while dists_are_good is False:
-                    draws_outer += 1
-                    if draws_outer > MAX_DRAWS_OUTER:
-                        raise ValueError('could not find suitable set of co-ordinates for set')
-
-                    draws_inner = 0
-                    coords_list = []
+                xx_to_use_ctr, yy_to_use_ctr = self._draw_random_centers(set_size)
 
-                    while less_than_set_size is True:
-                        yy_to_use_ctr = np.random.choice(yy)
-                        xx_to_use_ctr = np.random.choice(xx)
-                        coord = [xx_to_use_ctr, yy_to_use_ctr]
-                        draws_inner += 1
-                        if draws_inner > MAX_DRAWS_INNER:
-                            coords_list = []
-                            draws_inner = 0
-
-                        if len(coords_list) == 0:
-                            coords_list.append(coord)
-
-                            if set_size == 1:
-                                # then we're done actually
-                                less_than_set_size = False
-                                dists_are_good = True
-                                # make into an array of size (1,) to prevent crash when we index into them below
-                                yy_to_use_ctr = np.asarray([yy_to_use_ctr])
-                                xx_to_use_ctr = np.asarray([xx_to_use_ctr])
-                        else:
-                            coords_list_tmp = list(coords_list)
-                            coords_list_tmp.append(coord)
-                            coords_list_tmp = np.stack(coords_list_tmp)
-                            dists = pdist(coords_list_tmp)
-
-                            if np.any(dists < self.min_center_dist):
-                                continue
-                            else:
-                                coords_list = coords_list_tmp.tolist()
-
-                                if len(coords_list) < set_size:
-                                    continue
-                                else:
-                                    coords = np.asarray(coords_list)
-                                    yy_to_use_ctr = coords[:, 1]
-                                    xx_to_use_ctr = coords[:, 0]
-                                    dists_are_good = True
-                                    less_than_set_size = False
-
-        # set up window
-        display_surface = pygame.display.set_mode((self.window_size[1], self.window_size[0]),
-                                                  0,
-                                                  32)
+        # set up window, and clear whatever was drawn on it for the last stimulus
+        display_surface = self._get_display_surface()
 
         # draw on surface object
         display_surface.fill(colors_dict[self.background_color])
@@ -481,9 +622,185 @@ class AbstractStimMaker:
         if self.grid_size:
             grid_as_char = np.asarray(grid_as_char).reshape(self.grid_size[0], self.grid_size[1]).tolist()
 
-        pygame.display.update()
+        if not self.headless:
+            pygame.display.update()
         return self.RectTuple(display_surface=display_surface,
                               grid_as_char=grid_as_char,
                               target_indices=target_indices,
                               distractor_indices=distractor_indices,
                               voc_objects=voc_objects)
+
+    def _random_grid_placements(self, num_imgs, set_size):
+        """helper function used by make_stims that draws cells at random
+        for a batch of stimuli and computes the centers of items in them,
+        the same way make_stim does for a single stimulus
+
+        Returns
+        -------
+        cells : numpy.ndarray
+        xx_to_use_ctr : numpy.ndarray
+        yy_to_use_ctr : numpy.ndarray
+            all with shape (num_imgs, set_size)
+        """
+        # draw cells without replacement for each stimulus, by sorting random keys
+        cells = np.argsort(np.random.random_sample((num_imgs, self.num_cells)), axis=1)[:, :set_size]
+        cells = np.sort(cells, axis=1)
+
+        yy_to_use_ctr = self.cell_yy_ctr[cells]
+        xx_to_use_ctr = self.cell_xx_ctr[cells]
+
+        if self.jitter > 0:
+            # jitter range has self.jitter values. If jitter is even,
+            # a coin flip decides which end of the range to drop
+            jitter_low = -(self.jitter // 2)
+            if self.jitter % 2 == 0:
+                jitter_low = jitter_low + np.random.randint(2, size=(num_imgs, 1))
+            yy_to_use_ctr += jitter_low + np.random.randint(self.jitter, size=(num_imgs, set_size))
+            xx_to_use_ctr += jitter_low + np.random.randint(self.jitter, size=(num_imgs, set_size))
+
+        return cells, xx_to_use_ctr, yy_to_use_ctr
+
+    def _render_stims(self, xx_to_use_ctr, yy_to_use_ctr, labels, out=None):
+        """helper function used by make_stims that draws a batch of stimuli
+        with pygame, one after another, and copies each into an array
+
+        Returns
+        -------
+        images : numpy.ndarray
+            of uint8, with shape (num_imgs, height, width, 3).
+        bboxes : numpy.ndarray
+            of int, with shape (num_imgs, set_size, 4).
+            (xmin, ymin, xmax, ymax) of each item.
+        """
+        num_imgs, set_size = labels.shape
+        shape = (num_imgs, self.window_size[0], self.window_size[1], 3)
+        if out is None:
+            images = np.empty(shape, dtype=np.uint8)
+        else:
+            if out.shape != shape or out.dtype != np.uint8:
+                raise ValueError(
+                    f'out should be an array of uint8 with shape {shape} '
+                    f'but was {out.dtype} with shape {out.shape}'
+                )
+            images = out
+        bboxes = np.empty((num_imgs, set_size, 4), dtype=int)
+
+        display_surface = self._get_display_surface()
+        background_color = colors_dict[self.background_color]
+        # notice we are now using PyGame order of sizes, (width, height)
+        item_bbox_tuple = (0, 0) + (self.item_bbox_size[1], self.item_bbox_size[0])
+        for img_ind in range(num_imgs):
+            display_surface.fill(background_color)
+            for item in range(set_size):
+                item_bbox = Rect(item_bbox_tuple)
+                item_bbox.center = (int(xx_to_use_ctr[img_ind, item]), int(yy_to_use_ctr[img_ind, item]))
+                self._draw_voc_item(display_surface, item_bbox, VOC_NAMES[labels[img_ind, item]])
+                bboxes[img_ind, item] = (item_bbox.left, item_bbox.top, item_bbox.right, item_bbox.bottom)
+            # pixels3d is a view of the surface, with shape (width, height, 3), so there is only one copy
+            images[img_ind] = pygame.surfarray.pixels3d(display_surface).transpose(1, 0, 2)
+
+        if not self.headless:
+            pygame.display.update()
+        return images, bboxes
+
+    def make_stims(self,
+                   num_imgs,
+                   set_size=8,
+                   num_target=1,
+                   backend=None,
+                   out=None):
+        """make a batch of visual search stimuli, returned as arrays
+
+        Items are placed the same way as make_stim places them
+        when it is not given cells or centers, but no pygame.Rect or VOCObject
+        is made for each item.
+
+        Parameters
+        ----------
+        num_imgs : int
+            Number of stimuli to make.
+        set_size : int
+            Set size, equal to number of targets + distractors.
+            Default is 8.
+        num_target : int
+            Number of targets. Default is 1.
+        backend : str
+            One of {'pygame', 'numpy'}. Whether to draw the stimuli with pygame,
+            or with the NumPy rasterizer of stim makers that have a ``rasterize`` method.
+            Default is None, in which case 'numpy' is used if the stim maker has
+            a ``rasterize`` method, and otherwise 'pygame' is used.
+        out : numpy.ndarray
+            of uint8, with shape (num_imgs, height, width, 3).
+            Array to draw images into, e.g. a slice of a memory-mapped array.
+            Default is None, in which case a new array is allocated.
+
+        Returns
+        -------
+        stim_batch : StimBatch
+            named tuple with the following fields:
+                images : numpy.ndarray
+                    of uint8, with shape (num_imgs, height, width, 3).
+                centers : numpy.ndarray
+                    of int, with shape (num_imgs, set_size, 2).
+                    (x, y) co-ordinates of the center of each item.
+                bboxes : numpy.ndarray
+                    of int, with shape (num_imgs, set_size, 4).
+                    (xmin, ymin, xmax, ymax) of each item, the same as
+                    the boxes in the Pascal VOC annotations.
+                labels : numpy.ndarray
+                    of int, with shape (num_imgs, set_size).
+                    Label code of each item, an index into VOC_NAMES.
+                cells : numpy.ndarray
+                    of int, with shape (num_imgs, set_size).
+                    Cells in grid that contain items. None if the
+                    stim maker does not have a grid.
+        """
+        self._validate_set_size_and_num_target(set_size, num_target)
+
+        if type(num_imgs) != int:
+            raise TypeError('number of images must be an integer')
+
+        if num_imgs < 0:
+            raise ValueError('number of images must be greater than or equal to zero')
+
+        if backend is None:
+            backend = 'numpy' if hasattr(self, 'rasterize') else 'pygame'
+
+        if backend not in ('pygame', 'numpy'):
+            raise ValueError(
+                f"backend must be one of {{'pygame', 'numpy'}} but was: {backend}"
+            )
+
+        if backend == 'numpy' and not hasattr(self, 'rasterize'):
+            raise ValueError(
+                f"the 'numpy' backend is not available for {type(self).__name__}"
+            )
+
+        if self.grid_size:
+            cells, xx_to_use_ctr, yy_to_use_ctr = self._random_grid_placements(num_imgs, set_size)
+        else:
+            cells = None
+            xx_to_use_ctr = np.empty((num_imgs, set_size), dtype=int)
+            yy_to_use_ctr = np.empty((num_imgs, set_size), dtype=int)
+            for img_ind in range(num_imgs):
+                xx_to_use_ctr[img_ind], yy_to_use_ctr[img_ind] = self._draw_random_centers(set_size)
+
+        # draw targets without replacement for each stimulus, by sorting random keys
+        target_inds = np.argsort(np.random.random_sample((num_imgs, set_size)), axis=1)[:, :num_target]
+        is_target = np.zeros((num_imgs, set_size), dtype=bool)
+        is_target[np.arange(num_imgs)[:, np.newaxis], target_inds] = True
+        labels = self._voc_labels(is_target)
+
+        if backend == 'numpy':
+            images, bboxes = self.rasterize(xx_to_use_ctr,
+                                            yy_to_use_ctr,
+                                            np.asarray(VOC_NAMES)[labels],
+                                            out=out)
+        else:
+            images, bboxes = self._render_stims(xx_to_use_ctr, yy_to_use_ctr, labels, out=out)
+
+        return self.StimBatch(images=images,
+                              centers=np.stack([xx_to_use_ctr, yy_to_use_ctr], axis=-1).astype(int),
+                              bboxes=bboxes,
+                              labels=labels,
+                              cells=cells)
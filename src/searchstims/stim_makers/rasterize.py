@@ -0,0 +1,147 @@
+"""functions to draw batches of visual search stimuli into NumPy arrays,
+as an alternative to drawing each stimulus on a pygame.Surface"""
+import numpy as np
+
+from .abstract_stim_maker import colors_dict
+
+
+def to_rgb(color):
+    """convert color to a three-element tuple, looking up names in ``colors_dict``"""
+    if type(color) == str:
+        color = colors_dict[color]
+    return tuple(color)
+
+
+def item_bboxes(xx_to_use_ctr, yy_to_use_ctr, item_bbox_size):
+    """compute the top left corners of item bounding boxes from their centers,
+    the same way as setting ``pygame.Rect.center`` does
+
+    Parameters
+    ----------
+    xx_to_use_ctr : numpy.ndarray
+        co-ordinates of center of item bounding boxes on x axis.
+    yy_to_use_ctr : numpy.ndarray
+        co-ordinates of center of item bounding boxes on y axis.
+        Same shape as xx_to_use_ctr.
+    item_bbox_size : tuple
+        (height, width) of item bounding box, in pixels.
+
+    Returns
+    -------
+    left : numpy.ndarray
+        x co-ordinates of left side of item bounding boxes.
+    top : numpy.ndarray
+        y co-ordinates of top of item bounding boxes.
+    """
+    left = np.asarray(xx_to_use_ctr).astype(int) - item_bbox_size[1] // 2
+    top = np.asarray(yy_to_use_ctr).astype(int) - item_bbox_size[0] // 2
+    return left, top
+
+
+def new_images(num_imgs, window_size, background_color, out=None):
+    """get a batch of images filled with the background color
+
+    Parameters
+    ----------
+    num_imgs : int
+        number of images
+    window_size : tuple
+        (height, width) of images, in pixels.
+    background_color : str, tuple
+        color that images are filled with.
+    out : numpy.ndarray
+        of dtype uint8, with shape (num_imgs, height, width, 3).
+        Array to fill, e.g. a slice of a memory-mapped array.
+        Default is None, in which case a new array is allocated.
+
+    Returns
+    -------
+    images : numpy.ndarray
+        of dtype uint8, with shape (num_imgs, height, width, 3).
+    """
+    shape = (num_imgs, window_size[0], window_size[1], 3)
+    if out is None:
+        images = np.empty(shape, dtype=np.uint8)
+    else:
+        if out.shape != shape or out.dtype != np.uint8:
+            raise ValueError(
+                f'out should be an array of uint8 with shape {shape} '
+                f'but was {out.dtype} with shape {out.shape}'
+            )
+        images = out
+    # fill one image and then copy it to all of them, which is much faster
+    # than broadcasting the color along an innermost axis of length 3
+    background = np.empty(shape[1:], dtype=np.uint8)
+    background[...] = to_rgb(background_color)
+    images[...] = background
+    return images
+
+
+def fill_rects(images, left, top, width, height, colors):
+    """fill axis-aligned rectangles in a batch of images, in place.
+
+    Rectangles are clipped to the image, and they are drawn in order
+    along the second axis of the arrays that specify them, so that
+    a rectangle overwrites any earlier rectangle it overlaps.
+    This gives the same pixels as calling ``pygame.draw.rect``
+    with each rectangle in turn.
+
+    Parameters
+    ----------
+    images : numpy.ndarray
+        of dtype uint8, with shape (num_imgs, height, width, 3).
+    left : numpy.ndarray
+        of int, with shape (num_imgs, num_rects).
+        x co-ordinates of left side of rectangles.
+    top : numpy.ndarray
+        of int, with shape (num_imgs, num_rects).
+        y co-ordinates of top of rectangles.
+    width : int, numpy.ndarray
+        width of rectangles. Either an int, or an array
+        with shape (num_imgs, num_rects).
+    height : int, numpy.ndarray
+        height of rectangles. Either an int, or an array
+        with shape (num_imgs, num_rects).
+    colors : numpy.ndarray
+        of uint8, with shape (num_imgs, num_rects, 3).
+        RGB color of each rectangle.
+    """
+    num_imgs, img_height, img_width = images.shape[:3]
+    left = np.asarray(left)
+    num_rects = left.shape[1]
+    top, width, height = [
+        np.broadcast_to(arr, (num_imgs, num_rects)) for arr in (top, width, height)
+    ]
+    colors = np.asarray(colors)
+    if num_imgs == 0 or num_rects == 0:
+        return
+
+    # view of pixels as (num_imgs * img_height * img_width, 3), so that each
+    # rectangle can be filled by indexing with one array of flat offsets
+    pixels = images.reshape(-1, 3)
+    img_inds = np.arange(num_imgs)
+    for rect_ind in range(num_rects):
+        rect_left, rect_top = left[:, rect_ind], top[:, rect_ind]
+        rect_width, rect_height = width[:, rect_ind], height[:, rect_ind]
+        rect_colors = colors[:, rect_ind]
+
+        inside = ((rect_left >= 0) & (rect_top >= 0)
+                  & (rect_left + rect_width <= img_width) & (rect_top + rect_height <= img_height))
+        # fast path: rectangles entirely inside the image, grouped by shape
+        for shape in np.unique(np.stack([rect_height[inside], rect_width[inside]], axis=1), axis=0):
+            shape_height, shape_width = shape
+            in_group = np.nonzero(inside & (rect_height == shape_height) & (rect_width == shape_width))[0]
+            offsets = (np.arange(shape_height)[:, np.newaxis] * img_width
+                       + np.arange(shape_width)).ravel()
+            starts = (img_inds[in_group] * img_height + rect_top[in_group]) * img_width + rect_left[in_group]
+            pixels[starts[:, np.newaxis] + offsets] = rect_colors[in_group, np.newaxis, :]
+
+        # slow path: rectangles that need to be clipped to the image
+        clipped = np.nonzero(~inside)[0]
+        for img_ind in clipped:
+            xmin = max(rect_left[img_ind], 0)
+            xmax = min(rect_left[img_ind] + rect_width[img_ind], img_width)
+            ymin = max(rect_top[img_ind], 0)
+            ymax = min(rect_top[img_ind] + rect_height[img_ind], img_height)
+            if xmax > xmin and ymax > ymin:
+                images[img_ind, ymin:ymax, xmin:xmax] = rect_colors[img_ind]
@@ -0,0 +1,107 @@
+"""cache of sprites, i.e. rendered glyphs, used by the font-based stim makers"""
+from collections import OrderedDict
+from pathlib import Path
+
+import pygame
+
+THIS_FILE_DIR = Path(__file__).parent
+
+FORCEDSQUARE_PATH = str(THIS_FILE_DIR.joinpath('..', 'ttf', 'forced_square.ttf'))
+FONT_SIZE = 64
+
+# maximum number of sprites kept in the cache.
+# A run typically only uses a handful of distinct sprites
+MAX_SPRITES = 256
+
+
+class SpriteCache:
+    """least-recently-used cache of sprites
+
+    Each unique sprite, keyed by (character, color, item_bbox_size, rotation),
+    is rendered from the font, scaled, and rotated only once. After that
+    stim makers just blit the cached pygame.Surface.
+
+    Attributes
+    ----------
+    maxsize : int
+        maximum number of sprites to keep in cache. When it is full,
+        the least recently used sprite is evicted.
+    hits : int
+        number of times a sprite was found in the cache
+    misses : int
+        number of times a sprite had to be rendered
+    """
+    def __init__(self, maxsize=MAX_SPRITES):
+        if type(maxsize) != int or maxsize < 1:
+            raise ValueError(f'maxsize must be a positive integer but was: {maxsize}')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._fonts = {}
+        self._sprites = OrderedDict()
+
+    def __len__(self):
+        return len(self._sprites)
+
+    def _get_font(self, font_path):
+        # only read .ttf file from disk once
+        font = self._fonts.get(font_path)
+        if font is None:
+            font = pygame.font.Font(font_path, FONT_SIZE)
+            self._fonts[font_path] = font
+        return font
+
+    def get(self, character, color, item_bbox_size, rotation=0, font_path=FORCEDSQUARE_PATH):
+        """get sprite, rendering it if it is not already in the cache
+
+        Parameters
+        ----------
+        character : str
+            character to render, e.g. 'T'
+        color : tuple
+            3-item tuple, i.e. RGB color.
+        item_bbox_size : tuple
+            (height, width) in pixels that the rendered character is scaled to.
+        rotation : int
+            degrees to rotate sprite counter-clockwise, after scaling
+            (so rotated sprite has same aspect ratio as un-rotated).
+            Default is 0, i.e. no rotation.
+        font_path : str
+            path to .ttf file used to render character.
+            Default is the path to the forced square font that is packaged
+            with searchstims.
+
+        Returns
+        -------
+        sprite : pygame.Surface
+            Should not be drawn on, since it is re-used.
+        """
+        key = (character, color, tuple(item_bbox_size), rotation, font_path)
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            self._sprites.move_to_end(key)
+            return sprite
+
+        self.misses += 1
+        font = self._get_font(font_path)
+        sprite = font.render(character, True, color)
+        # notice we are now using PyGame order of sizes, (width, height)
+        sprite = pygame.transform.scale(sprite, (item_bbox_size[1], item_bbox_size[0]))
+        if rotation:
+            sprite = pygame.transform.rotate(sprite, rotation)
+
+        self._sprites[key] = sprite
+        if len(self._sprites) > self.maxsize:
+            self._sprites.popitem(last=False)
+        return sprite
+
+    def clear(self):
+        """remove all sprites from the cache"""
+        self._sprites.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# shared by all the font-based stim makers in a process
+sprite_cache = SpriteCache()
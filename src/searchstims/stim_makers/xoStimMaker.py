@@ -1,19 +1,16 @@
-from pathlib import Path
 import random
 
-import pygame
 from pygame.rect import Rect
 
 from .abstract_stim_maker import AbstractStimMaker
 from .abstract_stim_maker import colors_dict
+from .sprites import FORCEDSQUARE_PATH, sprite_cache
 from ..voc import VOCObject
 
-THIS_FILE_DIR = Path(__file__).parent
-
 
 class xoStimMaker(AbstractStimMaker):
 
-    forcedsquare_path = str(THIS_FILE_DIR.joinpath('..', 'ttf', 'forced_square.ttf'))
+    forcedsquare_path = FORCEDSQUARE_PATH
 
     """Make visual search stimuli where target is 'x' and distractors are 'x's and 'o's.
     Distractors can be same or different colors.
@@ -81,39 +78,18 @@ class xoStimMaker(AbstractStimMaker):
             item_bbox.center = center
 
             if item in target_inds:
-                is_target = True
-                color = self.target_x_color
                 target_indices.append(center)
                 if self.grid_size:
                     grid_as_char[cells_to_use[item]] = 't'
                 voc_name = 't'
             else:
-                is_target = False
                 distractor_letter = distractor_letters.pop()
-                if distractor_letter == 'x':
-                    color = self.distractor_x_color
-                    voc_name = 'dx'
-                elif distractor_letter == 'o':
-                    color = self.distractor_o_color
-                    voc_name = 'do'
+                voc_name = 'd' + distractor_letter
                 distractor_indices.append(center)
                 if self.grid_size:
                     grid_as_char[cells_to_use[item]] = distractor_letter
 
-            if type(color) == str:
-                color = colors_dict[color]
-
-            font_obj = pygame.font.Font(self.forcedsquare_path, 64)
-            if is_target:
-                text_surface_obj = font_obj.render('x', True, color)
-            else:
-                text_surface_obj = font_obj.render(distractor_letter, True, color)
-            text_surface_obj = pygame.transform.scale(text_surface_obj,
-                                                      (self.item_bbox_size[1], self.item_bbox_size[0]))
-
-            self.draw_item(display_surface=display_surface,
-                           item_bbox=item_bbox,
-                           to_blit=text_surface_obj)
+            self._draw_voc_item(display_surface, item_bbox, voc_name)
 
             voc_objects.append(
                 VOCObject.from_rect(rect=item_bbox, voc_name=voc_name)
@@ -121,6 +97,34 @@ class xoStimMaker(AbstractStimMaker):
 
         return grid_as_char, target_indices, distractor_indices, voc_objects
 
+    def _voc_labels(self, is_target):
+        """half of distractors are x ('dx') and half are o ('do')"""
+        return self._split_distractor_labels(is_target, 'dx', 'do')
+
+    def _draw_voc_item(self, display_surface, item_bbox, voc_name):
+        """draw target x ('t'), distractor x ('dx') or distractor o ('do')"""
+        if voc_name == 't':
+            color = self.target_x_color
+            character = 'x'
+        elif voc_name == 'dx':
+            color = self.distractor_x_color
+            character = 'x'
+        elif voc_name == 'do':
+            color = self.distractor_o_color
+            character = 'o'
+
+        if type(color) == str:
+            color = colors_dict[color]
+
+        text_surface_obj = sprite_cache.get(character,
+                                            color,
+                                            self.item_bbox_size,
+                                            font_path=self.forcedsquare_path)
+
+        self.draw_item(display_surface=display_surface,
+                       item_bbox=item_bbox,
+                       to_blit=text_surface_obj)
+
     def draw_item(self, display_surface, item_bbox, to_blit):
         """Returns target or distractor"""
         display_surface.blit(to_blit, item_bbox)
@@ -3,6 +3,7 @@ test make module
 """
 import csv
 from glob import glob
+from itertools import combinations
 import os
 from pathlib import Path
 import tempfile
@@ -13,7 +14,8 @@ import imageio
 import numpy as np
 
 from searchstims.config import parse
-from searchstims.make import make
+from searchstims.make import make, _binomial_table, _generate_xx_and_yy, _unrank_combination, _unrank_combinations
+from searchstims.stim_makers import RVvGVStimMaker
 from searchstims.main import _get_stim_dict
 
 
@@ -192,6 +194,95 @@ class TestMake(unittest.TestCase):
         self.assertTrue(self._files_got_made_num_target_present_absent_list(
             config, 'RVvGV', num_target_present, num_target_absent))
 
+    def test_make_num_workers(self):
+        config_file = os.path.join(self.test_configs, 'test_RVvGV_config.ini')
+        config = parse(config_file)
+        stim_dict = _get_stim_dict(config)
+
+        csv_rows = {}
+        for num_workers in (1, 2):
+            output_dir = Path(self.tmp_output_dir) / f'num_workers_{num_workers}'
+            make(root_output_dir=output_dir,
+                 stim_dict=stim_dict,
+                 csv_filename=config.general.csv_filename,
+                 num_target_present=config.general.num_target_present,
+                 num_target_absent=config.general.num_target_absent,
+                 set_sizes=config.general.set_sizes,
+                 num_workers=num_workers)
+            with open(output_dir / config.general.csv_filename) as fp:
+                reader = csv.DictReader(fp)
+                csv_rows[num_workers] = [
+                    (row['stimulus'], row['set_size'], row['target_condition'], row['img_num'], row['img_file'])
+                    for row in reader
+                ]
+
+        self.assertTrue(csv_rows[1] == csv_rows[2])
+        for img_file in [row[-1] for row in csv_rows[2]]:
+            self.assertTrue(
+                (Path(self.tmp_output_dir) / 'num_workers_2' / img_file).exists()
+            )
+
+    def test_make_num_workers_raises(self):
+        config_file = os.path.join(self.test_configs, 'test_RVvGV_config.ini')
+        config = parse(config_file)
+        stim_dict = _get_stim_dict(config)
+
+        with self.assertRaises(ValueError):
+            make(root_output_dir=self.tmp_output_dir,
+                 stim_dict=stim_dict,
+                 csv_filename=config.general.csv_filename,
+                 num_target_present=config.general.num_target_present,
+                 num_target_absent=config.general.num_target_absent,
+                 set_sizes=config.general.set_sizes,
+                 num_workers=0)
+
+    def test_unrank_combination(self):
+        for n, k in ((5, 1), (6, 3), (9, 4), (10, 10)):
+            binomials = _binomial_table(n, k)
+            num_combs = binomials[n][k]
+            unranked = [_unrank_combination(rank, n, k, binomials) for rank in range(num_combs)]
+            # every rank gives a different combination, and together they are all the combinations
+            self.assertTrue(len(set(unranked)) == num_combs)
+            self.assertTrue(set(unranked) == set(combinations(range(n), k)))
+
+    def test_generate_xx_and_yy_large_grid(self):
+        # C(100, 8) is ~1.9e11, too many combinations to list
+        stim_maker = RVvGVStimMaker(grid_size=(10, 10), item_bbox_size=(20, 20), window_size=(227, 227))
+        num_imgs = 500
+        (all_cells_to_use,
+         all_xx_to_use_ctr,
+         all_yy_to_use_ctr) = _generate_xx_and_yy(set_size=8, num_imgs=num_imgs, stim_maker=stim_maker)
+        self.assertTrue(all_cells_to_use.shape == (num_imgs, 8))
+        self.assertTrue(all_xx_to_use_ctr.shape == (num_imgs, 8))
+        self.assertTrue(all_yy_to_use_ctr.shape == (num_imgs, 8))
+        self.assertTrue(len(set(map(tuple, all_cells_to_use))) == num_imgs)
+        for cells_to_use, xx_to_use_ctr, yy_to_use_ctr in zip(all_cells_to_use, all_xx_to_use_ctr, all_yy_to_use_ctr):
+            self.assertTrue(len(set(cells_to_use)) == 8)
+            # all items in an image get the same jitter
+            self.assertTrue(np.unique(xx_to_use_ctr - stim_maker.cell_xx_ctr[cells_to_use]).size == 1)
+            self.assertTrue(np.unique(yy_to_use_ctr - stim_maker.cell_yy_ctr[cells_to_use]).size == 1)
+
+    def test_unrank_combinations(self):
+        for n, k in ((5, 1), (6, 3), (9, 4), (10, 10)):
+            binomials = _binomial_table(n, k)
+            ranks = np.arange(binomials[n][k])
+            unranked = _unrank_combinations(ranks, n, k, np.array(binomials, dtype=np.int64))
+            expected = [_unrank_combination(rank, n, k, binomials) for rank in range(binomials[n][k])]
+            self.assertTrue(list(map(tuple, unranked)) == expected)
+
+    def test_generate_xx_and_yy_jitter_unique(self):
+        # C(4, 2) = 6 combinations, fewer than the number of images, so jitter has to make them unique
+        stim_maker = RVvGVStimMaker(grid_size=(2, 2), jitter=5)
+        num_imgs = 100
+        (all_cells_to_use,
+         all_xx_to_use_ctr,
+         all_yy_to_use_ctr) = _generate_xx_and_yy(set_size=2, num_imgs=num_imgs, stim_maker=stim_maker)
+        placements = {
+            (tuple(xx_to_use_ctr), tuple(yy_to_use_ctr))
+            for xx_to_use_ctr, yy_to_use_ctr in zip(all_xx_to_use_ctr, all_yy_to_use_ctr)
+        }
+        self.assertTrue(len(placements) == num_imgs)
+
 
 if __name__ == '__main__':
     unittest.main()
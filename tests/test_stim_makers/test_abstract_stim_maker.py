@@ -0,0 +1,72 @@
+import pickle
+
+import numpy as np
+import pygame
+import pytest
+
+import searchstims.stim_makers
+
+
+@pytest.mark.parametrize(
+    'stim_maker_class, grid_size',
+    [
+        (searchstims.stim_makers.RVvGVStimMaker, (5, 5)),
+        (searchstims.stim_makers.Two_v_Five_StimMaker, (5, 5)),
+        (searchstims.stim_makers.RVvGVStimMaker, None),
+    ]
+)
+def test_headless_same_as_display(stim_maker_class, grid_size):
+    arrays = []
+    for headless in (True, False):
+        stim_maker = stim_maker_class(grid_size=grid_size, min_center_dist=30, headless=headless)
+        np.random.seed(42)
+        rect_tuple = stim_maker.make_stim(set_size=4, num_target=1)
+        arrays.append(pygame.surfarray.array3d(rect_tuple.display_surface))
+    assert np.array_equal(arrays[0], arrays[1])
+
+
+def test_headless_reuses_surface():
+    stim_maker = searchstims.stim_makers.RVvGVStimMaker(headless=True)
+    surface_1 = stim_maker.make_stim(set_size=8, num_target=1).display_surface
+    surface_2 = stim_maker.make_stim(set_size=2, num_target=0).display_surface
+    assert surface_1 is surface_2
+    assert surface_1.get_size() == (stim_maker.window_size[1], stim_maker.window_size[0])
+    # only the two items from the second stimulus should be drawn, nothing left over from the first
+    pixels = pygame.surfarray.array3d(surface_2)
+    colored = pixels.any(axis=-1)
+    expected_num_colored = 2 * (stim_maker.item_bbox_size[0] * (stim_maker.item_bbox_size[1] // 3))
+    assert colored.sum() == expected_num_colored
+
+
+def test_pickle_headless():
+    stim_maker = searchstims.stim_makers.Two_v_Five_StimMaker(headless=True)
+    stim_maker.make_stim(set_size=4, num_target=1)
+    unpickled = pickle.loads(pickle.dumps(stim_maker))
+    rect_tuple = unpickled.make_stim(set_size=4, num_target=1)
+    assert isinstance(rect_tuple.display_surface, pygame.Surface)
+
+
+@pytest.mark.parametrize(
+    'stim_maker_class',
+    [
+        searchstims.stim_makers.RVvGVStimMaker,
+        searchstims.stim_makers.RVvRHGVStimMaker,
+        searchstims.stim_makers.Two_v_Five_StimMaker,
+        searchstims.stim_makers.TStimMaker,
+        searchstims.stim_makers.TLStimMaker,
+        searchstims.stim_makers.xoStimMaker,
+    ]
+)
+@pytest.mark.parametrize('num_target', [0, 1])
+def test_make_stim(stim_maker_class, num_target):
+    stim_maker = stim_maker_class()
+    rect_tuple = stim_maker.make_stim(set_size=8, num_target=num_target)
+    voc_names = [voc_object.name for voc_object in rect_tuple.voc_objects]
+    assert len(voc_names) == 8
+    assert voc_names.count('t') == num_target
+    assert len(rect_tuple.target_indices) == num_target
+    assert len(rect_tuple.distractor_indices) == 8 - num_target
+    grid_chars = [char for row in rect_tuple.grid_as_char for char in row if char]
+    assert sorted(grid_chars) == sorted(
+        [voc_name if len(voc_name) == 1 else voc_name[1] for voc_name in voc_names]
+    )
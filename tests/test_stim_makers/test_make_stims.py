@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+import searchstims.stim_makers
+from searchstims.stim_makers.abstract_stim_maker import VOC_NAMES
+
+STIM_MAKER_CLASSES = [
+    searchstims.stim_makers.RVvGVStimMaker,
+    searchstims.stim_makers.RVvRHGVStimMaker,
+    searchstims.stim_makers.Two_v_Five_StimMaker,
+    searchstims.stim_makers.TStimMaker,
+    searchstims.stim_makers.TLStimMaker,
+    searchstims.stim_makers.xoStimMaker,
+]
+
+
+@pytest.mark.parametrize('stim_maker_class', STIM_MAKER_CLASSES)
+@pytest.mark.parametrize('grid_size', [(5, 5), None])
+@pytest.mark.parametrize(
+    'set_size, num_target',
+    [
+        (1, 1),
+        (1, 0),
+        (7, 0),
+        (8, 1),
+    ]
+)
+def test_make_stims(stim_maker_class, grid_size, set_size, num_target):
+    num_imgs = 10
+    stim_maker = stim_maker_class(grid_size=grid_size, min_center_dist=30)
+    stim_batch = stim_maker.make_stims(num_imgs, set_size=set_size, num_target=num_target)
+
+    assert stim_batch.images.dtype == np.uint8
+    assert stim_batch.images.shape == (num_imgs, stim_maker.window_size[0], stim_maker.window_size[1], 3)
+    assert stim_batch.centers.shape == (num_imgs, set_size, 2)
+    assert stim_batch.bboxes.shape == (num_imgs, set_size, 4)
+    assert stim_batch.labels.shape == (num_imgs, set_size)
+
+    assert np.all((stim_batch.labels == VOC_NAMES.index('t')).sum(axis=1) == num_target)
+    assert np.all(stim_batch.labels < len(VOC_NAMES))
+    # boxes contain their centers
+    xx, yy = stim_batch.centers[..., 0], stim_batch.centers[..., 1]
+    bboxes = stim_batch.bboxes
+    assert np.all((bboxes[..., 0] <= xx) & (xx <= bboxes[..., 2]))
+    assert np.all((bboxes[..., 1] <= yy) & (yy <= bboxes[..., 3]))
+    # something got drawn in every image
+    assert np.all(stim_batch.images.reshape(num_imgs, -1).any(axis=1))
+
+    if grid_size is None:
+        assert stim_batch.cells is None
+    else:
+        assert stim_batch.cells.shape == (num_imgs, set_size)
+        assert np.all(np.diff(stim_batch.cells, axis=1) > 0)  # sorted and unique
+
+
+@pytest.mark.parametrize(
+    'stim_maker_class',
+    [
+        searchstims.stim_makers.RVvGVStimMaker,
+        searchstims.stim_makers.RVvRHGVStimMaker,
+    ]
+)
+def test_make_stims_backends_are_same(stim_maker_class):
+    stim_maker = stim_maker_class()
+    stim_batches = []
+    for backend in ('pygame', 'numpy'):
+        np.random.seed(42)
+        stim_batches.append(
+            stim_maker.make_stims(20, set_size=6, num_target=1, backend=backend)
+        )
+    for field in ('images', 'centers', 'bboxes', 'labels', 'cells'):
+        assert np.array_equal(getattr(stim_batches[0], field), getattr(stim_batches[1], field))
+
+
+def test_make_stims_out():
+    stim_maker = searchstims.stim_makers.Two_v_Five_StimMaker()
+    out = np.zeros((4, stim_maker.window_size[0], stim_maker.window_size[1], 3), dtype=np.uint8)
+    stim_batch = stim_maker.make_stims(4, set_size=2, num_target=1, out=out)
+    assert stim_batch.images is out
+    assert out.any()
+
+
+def test_make_stims_raises():
+    stim_maker = searchstims.stim_makers.Two_v_Five_StimMaker()
+    with pytest.raises(ValueError):
+        stim_maker.make_stims(4, set_size=2, num_target=1, backend='numpy')
+    with pytest.raises(ValueError):
+        stim_maker.make_stims(4, set_size=2, num_target=3)
+    with pytest.raises(TypeError):
+        stim_maker.make_stims(4.0, set_size=2, num_target=1)
@@ -0,0 +1,68 @@
+import numpy as np
+import pygame
+import pytest
+
+import searchstims.stim_makers
+from searchstims.stim_makers.rasterize import fill_rects
+
+
+def test_fill_rects_clips_and_overwrites():
+    images = np.zeros((2, 10, 10, 3), dtype=np.uint8)
+    left = np.array([[-2, 3], [8, 0]])
+    top = np.array([[-2, 1], [8, 0]])
+    colors = np.array([[[255, 0, 0], [0, 255, 0]],
+                       [[0, 0, 255], [255, 255, 255]]], dtype=np.uint8)
+    fill_rects(images, left, top, 5, 4, colors)
+
+    surfaces = [pygame.Surface((10, 10), 0, 32) for _ in range(2)]
+    for img_ind, surface in enumerate(surfaces):
+        surface.fill((0, 0, 0))
+        for rect_ind in range(2):
+            pygame.draw.rect(surface,
+                             tuple(colors[img_ind, rect_ind]),
+                             pygame.Rect(left[img_ind, rect_ind], top[img_ind, rect_ind], 5, 4))
+        expected = pygame.surfarray.array3d(surface).transpose(1, 0, 2)
+        assert np.array_equal(images[img_ind], expected)
+
+
+@pytest.mark.parametrize(
+    'stim_maker_class, set_size',
+    [
+        (searchstims.stim_makers.RVvGVStimMaker, 1),
+        (searchstims.stim_makers.RVvGVStimMaker, 8),
+        (searchstims.stim_makers.RVvRHGVStimMaker, 1),
+        (searchstims.stim_makers.RVvRHGVStimMaker, 8),
+    ]
+)
+def test_rasterize_same_as_make_stim(stim_maker_class, set_size):
+    num_imgs = 20
+    # no grid, so we can pass any centers, including ones
+    # that make items overlap, or extend past the edge of the image
+    stim_maker = stim_maker_class(grid_size=None, item_bbox_size=(30, 27), background_color='white')
+    np.random.seed(42)
+    all_xx_to_use_ctr = np.random.randint(-5, stim_maker.window_size[1] + 5, size=(num_imgs, set_size))
+    all_yy_to_use_ctr = np.random.randint(-5, stim_maker.window_size[0] + 5, size=(num_imgs, set_size))
+
+    expected_images = []
+    expected_bboxes = []
+    voc_names = []
+    for xx_to_use_ctr, yy_to_use_ctr in zip(all_xx_to_use_ctr, all_yy_to_use_ctr):
+        rect_tuple = stim_maker.make_stim(set_size=set_size,
+                                          num_target=1,
+                                          xx_to_use_ctr=xx_to_use_ctr,
+                                          yy_to_use_ctr=yy_to_use_ctr)
+        expected_images.append(
+            pygame.surfarray.array3d(rect_tuple.display_surface).transpose(1, 0, 2)
+        )
+        expected_bboxes.append(
+            [[obj.xmin, obj.ymin, obj.xmax, obj.ymax] for obj in rect_tuple.voc_objects]
+        )
+        voc_names.append(
+            [obj.name for obj in rect_tuple.voc_objects]
+        )
+
+    images, bboxes = stim_maker.rasterize(all_xx_to_use_ctr, all_yy_to_use_ctr, np.array(voc_names))
+    assert images.dtype == np.uint8
+    assert images.shape == (num_imgs, stim_maker.window_size[0], stim_maker.window_size[1], 3)
+    assert np.array_equal(images, np.stack(expected_images))
+    assert np.array_equal(bboxes, np.array(expected_bboxes))
@@ -0,0 +1,67 @@
+import numpy as np
+import pygame
+import pytest
+
+import searchstims.stim_makers
+from searchstims.stim_makers.sprites import FONT_SIZE, FORCEDSQUARE_PATH, SpriteCache
+
+
+@pytest.mark.parametrize(
+    'character, color, item_bbox_size, rotation',
+    [
+        ('2', (255, 255, 255), (30, 30), 0),
+        ('T', (255, 255, 51), (30, 30), 90),
+        ('L', (100, 149, 237), (20, 40), 180),
+        ('x', (0, 0, 255), (30, 30), 0),
+    ]
+)
+def test_get_same_as_render(character, color, item_bbox_size, rotation):
+    font = pygame.font.Font(FORCEDSQUARE_PATH, FONT_SIZE)
+    expected = font.render(character, True, color)
+    expected = pygame.transform.scale(expected, (item_bbox_size[1], item_bbox_size[0]))
+    if rotation:
+        expected = pygame.transform.rotate(expected, rotation)
+
+    sprite_cache = SpriteCache()
+    sprite = sprite_cache.get(character, color, item_bbox_size, rotation)
+    assert sprite.get_size() == expected.get_size()
+    assert np.array_equal(
+        pygame.surfarray.array3d(sprite), pygame.surfarray.array3d(expected)
+    )
+    assert sprite_cache.get(character, color, item_bbox_size, rotation) is sprite
+    assert sprite_cache.misses == 1
+    assert sprite_cache.hits == 1
+
+
+def test_lru_eviction():
+    sprite_cache = SpriteCache(maxsize=2)
+    sprite_2 = sprite_cache.get('2', (255, 255, 255), (30, 30))
+    sprite_cache.get('5', (255, 255, 255), (30, 30))
+    # use '2' again so that '5' is least recently used
+    assert sprite_cache.get('2', (255, 255, 255), (30, 30)) is sprite_2
+    sprite_cache.get('T', (255, 255, 255), (30, 30))
+    assert len(sprite_cache) == 2
+    assert sprite_cache.get('2', (255, 255, 255), (30, 30)) is sprite_2
+    misses = sprite_cache.misses
+    sprite_cache.get('5', (255, 255, 255), (30, 30))
+    assert sprite_cache.misses == misses + 1
+
+
+@pytest.mark.parametrize(
+    'stim_maker_class',
+    [
+        searchstims.stim_makers.Two_v_Five_StimMaker,
+        searchstims.stim_makers.TStimMaker,
+        searchstims.stim_makers.TLStimMaker,
+        searchstims.stim_makers.xoStimMaker,
+    ]
+)
+def test_stim_makers_use_cache(stim_maker_class):
+    searchstims.stim_makers.sprites.sprite_cache.clear()
+    stim_maker = stim_maker_class()
+    for _ in range(10):
+        stim_maker.make_stim(set_size=8, num_target=1)
+    sprite_cache = searchstims.stim_makers.sprites.sprite_cache
+    # at most 5 unique sprites: target, plus two distractor types that can each be rotated or not
+    assert sprite_cache.misses <= 5
+    assert sprite_cache.hits + sprite_cache.misses == 80